@@ -0,0 +1,191 @@
+"""Offline benchmark: run every dataset script against recorded provider fixtures.
+
+Each code/ script (and one full `run_all.py --all --panel`) runs in its own process
+with a fresh cache and store, replaying bench/fixtures/ instead of the live
+APIs and uploading to a local stand-in for the Dune endpoint. Wall time, CPU
+time, peak RSS and bytes uploaded are reported per script and saved to
+bench/results/<commit>.json for comparison across commits:
+
+    python bench/bench.py                      # run, print and save
+    python bench/bench.py --only us_gdp        # a subset of datasets
+    python bench/bench.py --compare BASE [NEW] # diff two saved results (NEW defaults to the latest)
+"""
+import argparse
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures  # noqa: E402
+from fixtures import DATASETS  # noqa: E402
+
+
+# === Local stand-in for Dune's upload endpoint ===
+class DuneStandIn(BaseHTTPRequestHandler):
+    uploads = []
+    lock = threading.Lock()
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return body
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        wire = self._read_body()
+        body = gzip.decompress(wire) if self.headers.get("Content-Encoding") == "gzip" else wire
+        table = json.loads(body).get("table_name")
+        with self.lock:
+            self.uploads.append({"table": table, "wire_bytes": len(wire), "body_bytes": len(body)})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"success": true}')
+
+    def log_message(self, *args):
+        pass
+
+
+def start_dune_stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DuneStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# === One measured run ===
+def measure(command, env):
+    """Run command in a child process; returns wall seconds, CPU seconds and peak RSS (MB)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "ok": process.returncode == 0,
+        "wall_s": round(time.perf_counter() - start, 3),
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 3),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "error": stderr.decode(errors="replace").strip().splitlines()[-1] if process.returncode else None,
+    }
+
+
+def run_case(name, script_args, dune_url):
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(
+            os.environ,
+            DUNE_UPLOAD_URL=dune_url,
+            DUNE_API_KEY="bench",
+            FRED_API_KEY="bench",
+            COINDESK_API_KEY="bench",
+            PIPELINE_CACHE_DIR=os.path.join(scratch, "cache"),
+            PIPELINE_STORE_DIR=os.path.join(scratch, "store"),
+            PIPELINE_METRICS_DIR=os.path.join(scratch, "metrics"),
+        )
+        before = len(DuneStandIn.uploads)
+        result = measure([sys.executable, os.path.join(BENCH_DIR, "replay.py"), *script_args], env)
+        uploads = DuneStandIn.uploads[before:]
+    result["uploads"] = len(uploads)
+    result["uploaded_bytes"] = sum(upload["wire_bytes"] for upload in uploads)
+    result["payload_bytes"] = sum(upload["body_bytes"] for upload in uploads)
+    print(
+        f"{name:32s} {'ok ' if result['ok'] else 'ERR'} wall {result['wall_s']:7.2f}s  cpu {result['cpu_s']:7.2f}s  "
+        f"rss {result['peak_rss_mb']:7.1f}MB  uploaded {result['uploaded_bytes']:>11,}B"
+    )
+    if result["error"]:
+        print(f"    {result['error']}")
+    return result
+
+
+def run_bench(only=None):
+    if not fixtures.exists():
+        print("No fixtures found, synthesizing them (see bench/fixtures.py --record)")
+        fixtures.synthesize()
+
+    server = start_dune_stand_in()
+    dune_url = f"http://127.0.0.1:{server.server_port}/api/v1/table/upload/csv"
+    cases = {}
+    try:
+        for dataset in DATASETS:
+            if only and dataset.name not in only:
+                continue
+            if dataset.source == 'stored':
+                # Panels read the other datasets' stored tables; they run as part of run_all below
+                continue
+            cases[dataset.name] = run_case(dataset.name, [os.path.join(REPO_DIR, "code", dataset.script)], dune_url)
+        if not only:
+            cases["run_all"] = run_case("run_all", [os.path.join(REPO_DIR, "run_all.py"), "--all", "--panel"], dune_url)
+    finally:
+        server.shutdown()
+    return cases
+
+
+# === Stored results ===
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(cases):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    commit = git_commit()
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    with open(path, "w") as f:
+        json.dump({"commit": commit, "timestamp": time.time(), "python": sys.version.split()[0], "cases": cases},
+                  f, indent=2, sort_keys=True)
+    print(f"Results saved to {path}")
+
+
+def load_results(ref):
+    path = ref if os.path.exists(ref) else os.path.join(RESULTS_DIR, f"{ref}.json")
+    with open(path) as f:
+        return json.load(f)
+
+
+def latest_results():
+    paths = [os.path.join(RESULTS_DIR, name) for name in os.listdir(RESULTS_DIR) if name.endswith(".json")]
+    return max(paths, key=os.path.getmtime)
+
+
+def compare(base_ref, new_ref=None):
+    base, new = load_results(base_ref), load_results(new_ref or latest_results())
+    print(f"{'case':32s} {'wall':>17s} {'cpu':>17s} {'rss MB':>17s} {'uploaded B':>25s}   ({base['commit']} -> {new['commit']})")
+    for name, after in new["cases"].items():
+        before = base["cases"].get(name)
+        if before is None:
+            continue
+        cells = []
+        for key in ("wall_s", "cpu_s", "peak_rss_mb", "uploaded_bytes"):
+            change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            cells.append(f"{before[key]:>8g}->{after[key]:<8g}{change:+6.0f}%")
+        print(f"{name:32s} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of the dataset scripts.")
+    parser.add_argument("--only", nargs="+", help="dataset names to run")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT", help="compare two saved results (commit or path)")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare[:2])
+    else:
+        save_results(run_bench(args.only))
@@ -0,0 +1,182 @@
+"""Provider fixtures for the offline benchmark.
+
+Each provider has one gzipped JSON file under bench/fixtures/:
+
+    fred.json.gz       {"series": {id: {"frequency_short", "last_updated", "observations": [[date, value], ...]}}}
+                       optional per series: "vintages": {vintage_date: [[date, value], ...]}, the
+                       observations added or revised in each vintage
+    yahoo.json.gz      {"closes": {ticker: [[date, close], ...]}}
+    coingecko.json.gz  {"market_chart": {coin_id: chart}, "markets": [/coins/markets row, ...], "trending": {...}}
+    coindesk.json.gz   {"articles": [article, ...]}  (newest first)
+
+`python bench/fixtures.py --record` captures them from the live APIs (needs
+FRED_API_KEY / COINDESK_API_KEY); without --record deterministic synthetic
+fixtures of the same shape are generated.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+PROVIDERS = ("fred", "yahoo", "coingecko", "coindesk")
+
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "code"))
+
+from pipeline import DATASETS  # noqa: E402
+
+
+def _ids(source_prefix):
+    return sorted({id_ for dataset in DATASETS if dataset.source.startswith(source_prefix) for id_ in dataset.resolve_ids()})
+
+
+def fixture_path(provider):
+    return os.path.join(FIXTURES_DIR, f"{provider}.json.gz")
+
+
+def load(provider):
+    with gzip.open(fixture_path(provider), "rt") as f:
+        return json.load(f)
+
+
+def save(provider, data):
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    with gzip.open(fixture_path(provider), "wt") as f:
+        json.dump(data, f)
+
+
+def exists():
+    return all(os.path.exists(fixture_path(provider)) for provider in PROVIDERS)
+
+
+# === Synthetic fixtures ===
+FRED_FREQUENCIES = {'D': 'B', 'W': 'W-MON', 'M': 'MS', 'Q': 'QS', 'A': 'YS'}
+SYNTHETIC_FRED = {
+    'UMCSENT': 'M', 'DEXCHUS': 'D', 'DEXUSEU': 'D', 'DEXJPUS': 'D', 'GDP': 'Q',
+    'NYGDPMKTPCDWLD': 'A', 'PERMIT': 'M', 'CPIAUCSL': 'M', 'FEDFUNDS': 'M',
+    'M2SL': 'M', 'UNRATE': 'M', 'RSXFS': 'M',
+}
+
+
+def _walk(rng, n, start=100.0):
+    return start * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def synthesize(seed=0, articles=5_000, universe=0):
+    rng = np.random.default_rng(seed)
+    now = int(time.time())
+
+    series = {}
+    for series_id in _ids("fred"):
+        frequency = SYNTHETIC_FRED.get(series_id, 'M')
+        dates = pd.date_range("1960-01-01", pd.Timestamp.now().normalize(), freq=FRED_FREQUENCIES[frequency])
+        values = [round(v, 4) for v in _walk(rng, len(dates))]
+        series[series_id] = {
+            "frequency_short": frequency,
+            "last_updated": "2020-01-01 08:00:00-05",
+            "observations": [[d, str(v)] for d, v in zip(dates.strftime('%Y-%m-%d'), values)],
+        }
+    save("fred", {"series": series})
+
+    closes = {}
+    for ticker in _ids("yfinance"):
+        dates = pd.bdate_range("1993-01-29", pd.Timestamp.now().normalize())
+        closes[ticker] = [[d, float(v)] for d, v in zip(dates.strftime('%Y-%m-%d'), _walk(rng, len(dates)))]
+    save("yahoo", {"closes": closes})
+
+    charts, markets = {}, []
+    day_ms = 86_400_000
+    start_ms = (now // 86_400 - 365) * day_ms
+    # universe > 0 adds that many extra coins, for benchmarking a COINGECKO_TOP_N universe
+    for coin_id in _ids("coingecko") + [f"synthetic-coin-{i}" for i in range(universe)]:
+        timestamps = [start_ms + i * day_ms for i in range(366)] + [now * 1000]
+        prices = _walk(rng, len(timestamps), start=rng.uniform(1, 50_000))
+        volumes = rng.uniform(1e8, 5e10, len(timestamps))
+        supply = float(rng.uniform(1e7, 1e10))
+        charts[coin_id] = {
+            "prices": [[t, float(p)] for t, p in zip(timestamps, prices)],
+            "market_caps": [[t, float(p * supply)] for t, p in zip(timestamps, prices)],
+            "total_volumes": [[t, float(v)] for t, v in zip(timestamps, volumes)],
+        }
+        markets.append({
+            "id": coin_id, "symbol": coin_id[:4], "current_price": float(prices[-1]),
+            "market_cap": float(prices[-1] * supply), "circulating_supply": supply,
+        })
+    trending = {"coins": [
+        {"item": {"id": f"coin-{i}", "name": f"Coin {i}", "symbol": f"C{i}", "market_cap_rank": i + 1, "score": i}}
+        for i in range(15)
+    ]}
+    save("coingecko", {"market_chart": charts, "markets": markets, "trending": trending})
+
+    # Spread over the CoinDesk backfill window so the first run pages through all of them
+    published = np.sort(rng.integers(now - 89 * 86_400, now, articles))[::-1]
+    body = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40
+    save("coindesk", {"articles": [
+        {
+            "ID": int(i + 1), "URL": f"https://example.com/{i}", "TITLE": f"Article {i}", "BODY": body,
+            "SENTIMENT": ["POSITIVE", "NEUTRAL", "NEGATIVE"][i % 3], "UPVOTES": 0, "DOWNVOTES": 0,
+            "KEYWORDS": "BTC|ETH", "PUBLISHED_ON": int(ts),
+            "SOURCE_DATA": {"SOURCE_TYPE": "RSS", "NAME": "CoinDesk", "BENCHMARK_SCORE": 70},
+            "CATEGORY_DATA": [{"CATEGORY": "BTC"}, {"CATEGORY": "MARKET"}],
+        }
+        for i, ts in enumerate(published)
+    ]})
+
+
+# === Recording from the live APIs ===
+def record():
+    from pipeline import coindesk, coingecko, fred, yahoo
+
+    series = {}
+    for series_id in _ids("fred"):
+        info = fred.get_series_info(series_id)
+        data = fred.fetch_observations(series_id)
+        series[series_id] = {
+            "frequency_short": info["frequency_short"],
+            "last_updated": info["last_updated"],
+            "observations": [[d, "." if np.isnan(v) else repr(v)] for d, v in zip(data.index.strftime('%Y-%m-%d'), data.values)],
+        }
+    save("fred", {"series": series})
+
+    closes = yahoo.download_closes(_ids("yfinance"))
+    recorded = {}
+    for ticker in closes.columns:
+        data = closes[ticker].dropna()
+        recorded[ticker] = [[d, float(v)] for d, v in zip(data.index.strftime('%Y-%m-%d'), data.values)]
+    save("yahoo", {"closes": recorded})
+
+    coin_ids = _ids("coingecko")
+    save("coingecko", {
+        "market_chart": {coin_id: coingecko.get(f"/coins/{coin_id}/market_chart", vs_currency="usd", days=365) for coin_id in coin_ids},
+        "markets": list(coingecko.get_coin_markets(coin_ids).values()),
+        "trending": coingecko.get_search_trending(),
+    })
+
+    # Raw pages, newest first, as far back as the pipeline's first run would backfill
+    articles, to_ts = [], int(time.time())
+    from_ts = to_ts - 90 * 86_400
+    while to_ts >= from_ts:
+        page = coindesk.fetch_page(coindesk.TRUSTED_SOURCES, to_ts)
+        if not page:
+            break
+        articles.extend(page)
+        to_ts = page[-1]["PUBLISHED_ON"] - 1
+    save("coindesk", {"articles": articles})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the benchmark's provider fixtures.")
+    parser.add_argument("--record", action="store_true", help="record from the live APIs instead of synthesizing")
+    parser.add_argument("--universe", type=int, default=0, help="extra synthetic coins for COINGECKO_TOP_N runs")
+    args = parser.parse_args()
+    if args.record:
+        record()
+    else:
+        synthesize(universe=args.universe)
+    print(f"Fixtures written to {FIXTURES_DIR}")
@@ -0,0 +1,213 @@
+"""Serve recorded provider fixtures in place of the live APIs.
+
+install() starts a local HTTP server answering the FRED, CoinGecko and
+CoinDesk endpoints, points the pipeline's provider URLs at it, swaps in a
+stand-in `yfinance` module and lifts the rate limits, so a dataset runs end
+to end without the network.
+
+`python bench/replay.py <script or run_all.py> [args...]` runs a script that way.
+"""
+import json
+import os
+import re
+import runpy
+import sys
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "code"))
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures  # noqa: E402
+
+
+class Fixtures:
+    def __init__(self):
+        self.fred = fixtures.load("fred")["series"]
+        self.coingecko = fixtures.load("coingecko")
+        self.articles = fixtures.load("coindesk")["articles"]
+
+    def respond(self, target):
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        for route, handler in self.ROUTES:
+            match = re.fullmatch(route, url.path)
+            if match:
+                return handler(self, params, *match.groups())
+        return 404, {"error": f"no fixture for {url.path}"}
+
+    # === FRED ===
+    @staticmethod
+    def fred_vintages(series):
+        # Fixtures without recorded vintages have one, publishing every observation (no earlier than the last)
+        published = max(series["last_updated"][:10], series["observations"][-1][0] if series["observations"] else "")
+        return series.get("vintages") or {published: series["observations"]}
+
+    def fred_observations(self, params):
+        series = self.fred.get(params["series_id"])
+        if series is None:
+            return 400, {"error_message": "Bad Request. The series does not exist."}
+        if params.get("output_type") == "3":
+            return 200, self.fred_revisions(params, series)
+        if params.get("output_type") == "4":
+            return 200, self.fred_initial_releases(series)
+        start = params.get("observation_start", "")
+        return 200, {"observations": [
+            {"date": date, "value": value} for date, value in series["observations"] if date >= start
+        ]}
+
+    def fred_revisions(self, params, series):
+        """New and revised observations by vintage: "." where a vintage left the observation unchanged,
+        or where it is missing (FRED's missing value)."""
+        vintages = self.fred_vintages(series)
+        columns = {vintage: f"{params['series_id']}_{vintage.replace('-', '')}" for vintage in params["vintage_dates"].split(",")}
+        rows = {}
+        for vintage, column in columns.items():
+            for date, value in vintages.get(vintage, []):
+                rows.setdefault(date, dict.fromkeys(columns.values(), "."))[column] = value
+        return {"observations": [{"date": date, **rows[date]} for date in sorted(rows)]}
+
+    def fred_initial_releases(self, series):
+        """Each observation at its first vintage, with that vintage as its realtime_start."""
+        first = {}
+        for vintage, observations in sorted(self.fred_vintages(series).items()):
+            for date, value in observations:
+                first.setdefault(date, (vintage, value))
+        return {"observations": [
+            {"realtime_start": vintage, "realtime_end": vintage, "date": date, "value": value}
+            for date, (vintage, value) in sorted(first.items())
+        ]}
+
+    def fred_vintage_dates(self, params):
+        series = self.fred.get(params["series_id"])
+        if series is None:
+            return 400, {"error_message": "Bad Request. The series does not exist."}
+        start = params.get("realtime_start", "")
+        dates = sorted(date for date in self.fred_vintages(series) if date >= start)
+        if params.get("sort_order") == "desc":
+            dates.reverse()
+        if "limit" in params:
+            dates = dates[:int(params["limit"])]
+        return 200, {"vintage_dates": dates}
+
+    def fred_series(self, params):
+        series = self.fred.get(params["series_id"])
+        if series is None:
+            return 400, {"error_message": "Bad Request. The series does not exist."}
+        return 200, {"seriess": [{
+            "id": params["series_id"],
+            "frequency_short": series["frequency_short"],
+            "last_updated": series["last_updated"],
+        }]}
+
+    # === CoinGecko ===
+    def coingecko_market_chart(self, params, coin_id):
+        chart = self.coingecko["market_chart"].get(coin_id)
+        return (200, chart) if chart is not None else (404, {"error": "coin not found"})
+
+    def coingecko_market_chart_range(self, params, coin_id):
+        chart = self.coingecko["market_chart"].get(coin_id)
+        if chart is None:
+            return 404, {"error": "coin not found"}
+        start_ms, end_ms = int(params["from"]) * 1000, int(params["to"]) * 1000
+        return 200, {series: [p for p in points if start_ms <= p[0] <= end_ms] for series, points in chart.items()}
+
+    def coingecko_markets(self, params):
+        if "ids" in params:
+            ids = set(params["ids"].split(","))
+            return 200, [row for row in self.coingecko["markets"] if row["id"] in ids]
+        # Ranked listing, paged like the real endpoint
+        ranked = sorted(self.coingecko["markets"], key=lambda row: row["market_cap"], reverse=True)
+        per_page, page = int(params.get("per_page", 100)), int(params.get("page", 1))
+        return 200, ranked[(page - 1) * per_page:page * per_page]
+
+    def coingecko_trending(self, params):
+        return 200, self.coingecko["trending"]
+
+    # === CoinDesk ===
+    def coindesk_articles(self, params):
+        to_ts, limit = int(params["to_ts"]), int(params["limit"])
+        page = [article for article in self.articles if article["PUBLISHED_ON"] <= to_ts][:limit]
+        return 200, {"Data": page}
+
+    ROUTES = [
+        (r"/fred/series/observations", fred_observations),
+        (r"/fred/series/vintagedates", fred_vintage_dates),
+        (r"/fred/series", fred_series),
+        (r"/api/v3/coins/([^/]+)/market_chart", coingecko_market_chart),
+        (r"/api/v3/coins/([^/]+)/market_chart/range", coingecko_market_chart_range),
+        (r"/api/v3/search/trending", coingecko_trending),
+        (r"/api/v3/coins/markets", coingecko_markets),
+        (r"/news/v1/article/list", coindesk_articles),
+    ]
+
+
+def fake_yfinance():
+    closes = {
+        ticker: pd.Series(
+            [close for _, close in rows],
+            index=pd.DatetimeIndex([date for date, _ in rows]),
+        )
+        for ticker, rows in fixtures.load("yahoo")["closes"].items()
+    }
+
+    def download(tickers, period=None, start=None, progress=True, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frame = pd.DataFrame({ticker: closes.get(ticker, pd.Series(dtype=float)) for ticker in tickers})
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        frame.columns = pd.MultiIndex.from_product([["Close"], tickers], names=["Price", "Ticker"])
+        return frame
+
+    return types.SimpleNamespace(download=download)
+
+
+def serve(replay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status, payload = replay.respond(self.path)
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def install():
+    from pipeline import config, ratelimit
+
+    base = f"http://127.0.0.1:{serve(Fixtures()).server_port}"
+    config.FRED_OBSERVATIONS_URL = f"{base}/fred/series/observations"
+    config.FRED_SERIES_URL = f"{base}/fred/series"
+    config.FRED_VINTAGE_DATES_URL = f"{base}/fred/series/vintagedates"
+    config.COINGECKO_API_URL = f"{base}/api/v3"
+    config.COINDESK_ARTICLES_URL = f"{base}/news/v1/article/list"
+    sys.modules["yfinance"] = fake_yfinance()
+    # Fixtures are local, so the provider limits would only measure sleep time
+    for provider in ratelimit.BUCKETS:
+        ratelimit.BUCKETS[provider] = ratelimit.TokenBucket(1e9, 1e9)
+
+
+if __name__ == "__main__":
+    script = sys.argv[1]
+    sys.argv = sys.argv[1:]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    install()
+    runpy.run_path(script, run_name="__main__")
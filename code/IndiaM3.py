@@ -0,0 +1,5 @@
+# === India M3 Sources Data to Dune ===
+from pipeline import run_dataset
+
+if __name__ == "__main__":
+    run_dataset("india_m3_sources")
@@ -0,0 +1,5 @@
+# === Korea M2 Data to Dune ===
+from pipeline import run_dataset
+
+if __name__ == "__main__":
+    run_dataset("korea_m2")
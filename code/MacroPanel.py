@@ -0,0 +1,5 @@
+# === Macro Panel (built from the stored macro tables) to Dune ===
+from pipeline import run_dataset
+
+if __name__ == "__main__":
+    run_dataset("macro_panel")
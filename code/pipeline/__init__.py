@@ -0,0 +1,18 @@
+from .engine import (
+    backfill_datasets, rebuild_dataset, resume_dataset, resume_datasets, reupload_dataset, run_dataset, run_datasets,
+)
+from .registry import COINS, DATASETS, Dataset, get_dataset
+
+__all__ = [
+    "COINS",
+    "DATASETS",
+    "Dataset",
+    "backfill_datasets",
+    "get_dataset",
+    "rebuild_dataset",
+    "resume_dataset",
+    "resume_datasets",
+    "reupload_dataset",
+    "run_dataset",
+    "run_datasets",
+]
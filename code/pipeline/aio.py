@@ -0,0 +1,131 @@
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import json
+import threading
+
+import aiohttp
+
+from . import config, ratelimit
+
+# One event loop per process, running in a daemon thread, with one connection pool (aiohttp session)
+# shared by every provider request and Dune upload. Synchronous code hands coroutines to it with run().
+_loop = None
+_thread = None
+_session = None
+_start_lock = threading.Lock()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, url):
+        super().__init__(f"{status} error for url: {url}")
+        self.status = status
+
+
+class Response:
+    """A finished response with its body read, so it outlives the connection it came from."""
+
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(self.status_code, self.url)
+
+
+# === The shared loop ===
+def event_loop():
+    global _loop, _thread
+    with _start_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="pipeline-aio", daemon=True)
+            _thread.start()
+            atexit.register(close)
+    return _loop
+
+
+def session():
+    """The shared aiohttp session; only used from the loop's thread."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=config.HTTP_MAX_CONNECTIONS),
+            timeout=aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT),
+        )
+    return _session
+
+
+def _settle(future, task):
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+def run(coro):
+    """Run coro on the shared loop and wait for its result.
+
+    The coroutine runs in a copy of the caller's context, so the requests it makes
+    land in the caller's telemetry span.
+    """
+    loop = event_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("aio.run() called from the event loop; await the coroutine instead")
+    future = concurrent.futures.Future()
+
+    def start():
+        loop.create_task(coro).add_done_callback(lambda task: _settle(future, task))
+
+    loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+    return future.result()
+
+
+def close():
+    if _loop is None or not _loop.is_running():
+        return
+    if _session is not None and not _session.closed:
+        asyncio.run_coroutine_threadsafe(_session.close(), _loop).result(timeout=5)
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+# === Requests ===
+async def iterate(chunks):
+    """A synchronous chunk generator as an async one; each chunk is produced off the loop's thread."""
+    chunks = iter(chunks)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+async def send(method, url, params=None, timeout=None, **kwargs):
+    """One request over the shared session, without rate limiting or retries."""
+    if params is not None:
+        # Like requests, leave out unset parameters (aiohttp rejects None)
+        params = {key: value for key, value in params.items() if value is not None}
+    if timeout is not None:
+        kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+    async with session().request(method, url, params=params, **kwargs) as response:
+        return Response(response.status, response.headers, await response.read(), str(response.url))
+
+
+async def request(provider, method, url, **kwargs):
+    """A request under the provider's rate limit, with retries (see ratelimit.call)."""
+    return await ratelimit.call(provider, lambda: send(method, url, **kwargs))
+
+
+async def get_json(provider, url, **params):
+    response = await request(provider, "GET", url, params=params)
+    response.raise_for_status()
+    return response.json()
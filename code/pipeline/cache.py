@@ -0,0 +1,98 @@
+import contextlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks then only hold between the threads of one process
+    fcntl = None
+
+
+# === Atomic writes: readers see the old file or the new one, never a partial write ===
+@contextlib.contextmanager
+def atomic_path(path):
+    """Yield a temporary path to write to; it replaces path when the block succeeds."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique per process and thread, so concurrent writers never share a temporary file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp_path
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    with atomic_path(path) as tmp_path, open(tmp_path, "w") as f:
+        json.dump(data, f, **dump_kwargs)
+
+
+# === Locks (<path>.lock), held against other threads and other processes ===
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextlib.contextmanager
+def locked(path):
+    """Hold path exclusively for a read-modify-write, waiting for any other holder."""
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(path, threading.Lock())
+    with thread_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+
+def try_lock(path):
+    """The open lock file of path, locked exclusively, or None if another thread or process holds it.
+
+    The lock is released when the file is closed.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock_file = open(f"{path}.lock", "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+    return lock_file
+
+
+# === Cached observation series (date-indexed CSV) ===
+def load_series(path, column):
+    if not os.path.exists(path):
+        return None
+    # round_trip: pandas' default float parser can be off by an ulp, which would make
+    # unchanged history look revised (and defeat the upload hash and incremental indicators)
+    cached = pd.read_csv(path, index_col='date', parse_dates=['date'], float_precision='round_trip')
+    return cached[column].rename(None)
+
+
+def save_series(path, data, column):
+    with atomic_path(path) as tmp_path:
+        data.rename(column).rename_axis('date').to_csv(tmp_path)
+
+
+def watermark(cached):
+    """Last cached observation date, or None when nothing is cached yet."""
+    if cached is None or cached.empty:
+        return None
+    return cached.index.max()
+
+
+def merge_observations(cached, new):
+    """Overlay newly fetched observations on the cached history (new values win)."""
+    if cached is None or cached.empty:
+        return new.sort_index()
+    if new.empty:
+        return cached
+    merged = pd.concat([cached[~cached.index.isin(new.index)], new])
+    return merged.sort_index()
@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import feather
+
+from . import aio, cache, config
+
+COINDESK_CACHE_DIR = os.path.join(config.CACHE_DIR, "coindesk")
+COINDESK_PAGE_LIMIT = 100
+# The table keeps the newest articles only, as the original 100 x 100 call window did
+COINDESK_MAX_ARTICLES = 10_000
+
+# Output columns of the coindesk_sentiment table, plus the raw timestamp used for ordering and watermarks
+COLUMNS = [
+    "id", "url", "title", "body", "sentiment", "upvotes", "downvotes", "keywords",
+    "published_on", "source_type", "source_name", "benchmark_score", "categories",
+]
+TIMESTAMP_COLUMN = "published_ts"
+
+TRUSTED_SOURCES = [
+    "coindesk", "cointelegraph", "blockworks", "decrypt", "bitcoinmagazine",
+    "theblock", "bloomberg_crypto_", "forbes", "yahoofinance",
+    "financialtimes_crypto_", "seekingalpha"
+]
+
+
+async def fetch_page_async(source_ids, to_ts, limit=COINDESK_PAGE_LIMIT):
+    params = {
+        "api_key": config.COINDESK_API_KEY,
+        "limit": limit,
+        "to_ts": to_ts,
+        "lang": "EN",
+        "source_ids": ",".join(source_ids)
+    }
+    return (await aio.get_json('coindesk', config.COINDESK_ARTICLES_URL, **params)).get("Data", [])
+
+
+def fetch_page(source_ids, to_ts, limit=COINDESK_PAGE_LIMIT):
+    return aio.run(fetch_page_async(source_ids, to_ts, limit))
+
+
+# === Projection onto the table's columns ===
+def project(article):
+    """The table row for one API article; everything else in the payload is dropped."""
+    published_ts = article.get("PUBLISHED_ON")
+    source = article.get("SOURCE_DATA") or {}
+    return (
+        article.get("ID"),
+        article.get("URL"),
+        article.get("TITLE"),
+        article.get("BODY"),
+        article.get("SENTIMENT"),
+        article.get("UPVOTES"),
+        article.get("DOWNVOTES"),
+        article.get("KEYWORDS"),
+        datetime.fromtimestamp(published_ts, timezone.utc).strftime('%Y-%m-%d') if published_ts else None,
+        source.get("SOURCE_TYPE"),
+        source.get("NAME"),
+        source.get("BENCHMARK_SCORE"),
+        "|".join(category.get("CATEGORY") for category in article.get("CATEGORY_DATA") or []),
+        published_ts,
+    )
+
+
+# Arrow types of the projected columns; nullable ints come out as float64 in pandas, as before
+SCHEMA = pa.schema(
+    [(name, pa.int64() if name in ("id", "upvotes", "downvotes", "benchmark_score") else pa.string()) for name in COLUMNS]
+    + [(TIMESTAMP_COLUMN, pa.int64())]
+)
+
+
+class ColumnBuffer:
+    """Projected rows, converted to an Arrow record batch at the end of every page.
+
+    Only the current page is held as Python objects; earlier pages live in
+    compact Arrow buffers until to_table() assembles them (without copying).
+    """
+
+    def __init__(self):
+        self.batches = []
+        self._reset()
+
+    def _reset(self):
+        self.columns = {name: [] for name in SCHEMA.names}
+        self._appenders = [values.append for values in self.columns.values()]
+
+    def append(self, article):
+        for append, value in zip(self._appenders, project(article)):
+            append(value)
+
+    def flush(self):
+        if self.columns[TIMESTAMP_COLUMN]:
+            self.batches.append(pa.RecordBatch.from_pydict(self.columns, schema=SCHEMA))
+            self._reset()
+
+    def __len__(self):
+        return sum(batch.num_rows for batch in self.batches) + len(self.columns[TIMESTAMP_COLUMN])
+
+    def to_table(self):
+        self.flush()
+        return pa.Table.from_batches(self.batches, schema=SCHEMA)
+
+
+# === Pagination ===
+async def paginate_async(source_ids, to_ts, from_ts=None, stop_ids=(), max_calls=100):
+    """Page backwards from to_ts through the article list.
+
+    Stops at an empty page, at the first article older than from_ts, or at the
+    first article whose ID is in stop_ids (already stored). Each page is
+    projected onto the table's columns as it arrives, so only one raw page is
+    held at a time. Returns (table, complete); complete is False when a
+    request failed midway.
+    """
+    buffer = ColumnBuffer()
+    for call_count in range(1, max_calls + 1):
+        print(f"API Call #{call_count} (to_ts={to_ts})")
+        try:
+            page = await fetch_page_async(source_ids, to_ts)
+        except Exception as e:
+            print(f"Request failed: {e}")
+            return buffer.to_table(), False
+        if not page:
+            return buffer.to_table(), True
+
+        for article in page:
+            if article.get("ID") in stop_ids:
+                return buffer.to_table(), True
+            if from_ts is not None and article.get("PUBLISHED_ON", to_ts) < from_ts:
+                return buffer.to_table(), True
+            buffer.append(article)
+        buffer.flush()
+        to_ts = page[-1].get('PUBLISHED_ON', to_ts) - 1
+
+    return buffer.to_table(), from_ts is None and not stop_ids
+
+
+def paginate(source_ids, to_ts, from_ts=None, stop_ids=(), max_calls=100):
+    return aio.run(paginate_async(source_ids, to_ts, from_ts, stop_ids, max_calls))
+
+
+def backfill(source_ids, from_ts, to_ts, windows=8):
+    """Split [from_ts, to_ts] into disjoint windows, page them concurrently and merge."""
+    step = max((to_ts - from_ts) // windows, 1)
+    bounds = [(start, min(start + step - 1, to_ts)) for start in range(from_ts, to_ts + 1, step)]
+
+    async def page_all():
+        return await asyncio.gather(*(
+            paginate_async(source_ids, window_end, from_ts=window_start, max_calls=1_000)
+            for window_start, window_end in bounds
+        ))
+
+    tables, complete = [], True
+    for window_table, window_complete in aio.run(page_all()):
+        tables.append(window_table)
+        complete = complete and window_complete
+    # Windows are disjoint and listed oldest first; newest first lets the merge skip its copy
+    return merge_articles(*reversed(tables)), complete
+
+
+def merge_articles(*tables, max_articles=None):
+    """Newest-first union of projected article tables, with duplicate IDs removed (first one wins)."""
+    merged = pa.concat_tables(tables) if tables else SCHEMA.empty_table()
+    # Arrow's sort is stable, so among equal timestamps the earlier table's copy comes first
+    order = pc.sort_indices(merged, sort_keys=[(TIMESTAMP_COLUMN, "descending", "at_end")])
+    ids = pc.take(merged.column("id"), order).to_pandas()
+    keep = order.to_numpy()[~ids.duplicated().to_numpy()][:max_articles]
+    if np.array_equal(keep, np.arange(len(keep))):
+        # Tables passed newest first with nothing to drop (the usual case) need no copy at all
+        return merged.slice(0, len(keep))
+    return merged.take(keep)
+
+
+# === Local article cache (projected rows in an Arrow file) ===
+def _cache_path(source_ids, extension="arrow"):
+    key = hashlib.sha1(",".join(sorted(source_ids)).encode()).hexdigest()[:8]
+    return os.path.join(COINDESK_CACHE_DIR, f"articles_{key}.{extension}")
+
+
+def load_cached_articles(source_ids):
+    path = _cache_path(source_ids)
+    if os.path.exists(path):
+        return feather.read_table(path, memory_map=True)
+
+    # Older caches held the raw articles as JSON lines; project them one page's worth at a time
+    legacy_path = _cache_path(source_ids, "jsonl")
+    buffer = ColumnBuffer()
+    if os.path.exists(legacy_path):
+        with open(legacy_path) as f:
+            for line in f:
+                if line.strip():
+                    buffer.append(json.loads(line))
+                    if len(buffer.columns[TIMESTAMP_COLUMN]) == COINDESK_PAGE_LIMIT:
+                        buffer.flush()
+    return buffer.to_table()
+
+
+def save_cached_articles(source_ids, articles):
+    with cache.atomic_path(_cache_path(source_ids)) as tmp_path:
+        feather.write_feather(articles, tmp_path, compression="uncompressed")
+    legacy_path = _cache_path(source_ids, "jsonl")
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
+# === Incremental fetch ===
+def get_articles(source_ids=TRUSTED_SOURCES, backfill_days=config.COINDESK_BACKFILL_DAYS):
+    """Newest articles for source_ids as an Arrow table of projected rows, only paging
+    through what is newer than the cache.
+
+    With an empty cache the last backfill_days are backfilled in parallel windows.
+    """
+    source_ids = list(source_ids)
+    now = int(time.time())
+    stored = load_cached_articles(source_ids)
+
+    if stored.num_rows:
+        # Only articles at or after the newest stored second can be new
+        newest_ts = pc.max(stored.column(TIMESTAMP_COLUMN)).as_py() or 0
+        newest = stored.filter(pc.greater_equal(stored.column(TIMESTAMP_COLUMN), newest_ts))
+        stored_ids = set(newest.column("id").to_pylist())
+        new, complete = paginate(source_ids, now, from_ts=newest_ts, stop_ids=stored_ids)
+        print(f"📰 {len(new)} new CoinDesk articles since {newest_ts}")
+    else:
+        new, complete = backfill(source_ids, now - backfill_days * 86400, now)
+
+    articles = merge_articles(new, stored, max_articles=COINDESK_MAX_ARTICLES)
+    # A partial page-through would leave a gap behind the new watermark, so only complete fetches are kept
+    if complete:
+        save_cached_articles(source_ids, articles)
+    return articles
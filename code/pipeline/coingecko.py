@@ -0,0 +1,340 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+from . import aio, cache, config
+
+MARKET_CHART_CACHE_DIR = os.path.join(config.CACHE_DIR, "coingecko", "market_chart")
+UNIVERSE_CACHE_DIR = os.path.join(config.CACHE_DIR, "coingecko", "universe")
+RANGE_CACHE_DIR = os.path.join(config.CACHE_DIR, "coingecko", "range")
+# The top-N ranking is refreshed once a day
+UNIVERSE_TTL = 24 * 60 * 60
+
+
+async def get_async(path, **params):
+    """GET a CoinGecko v3 endpoint under the shared rate limit and return the JSON body."""
+    return await aio.get_json('coingecko', f"{config.COINGECKO_API_URL}{path}", **params)
+
+
+def get(path, **params):
+    return aio.run(get_async(path, **params))
+
+
+def get_search_trending():
+    return get("/search/trending")
+
+
+# === Market snapshot for many coins (/coins/markets), cached for the run ===
+MARKETS_PAGE_SIZE = 250  # the endpoint's maximum per_page
+_markets = {}
+_markets_lock = threading.Lock()
+
+
+def _remember_markets(rows, vs_currency):
+    for row in rows:
+        _markets[(row['id'], vs_currency)] = row
+
+
+def get_coin_markets(coin_ids, vs_currency='usd'):
+    """{coin_id: /coins/markets row} (price, market cap, circulating supply, ...) for every coin.
+
+    One request per 250 coins instead of one /coins/{id} call per coin; rows are
+    kept in memory so the rest of the run reuses them. Unknown coins are left out.
+    """
+    coin_ids = list(dict.fromkeys(coin_ids))
+    with _markets_lock:
+        wanted = [coin_id for coin_id in coin_ids if (coin_id, vs_currency) not in _markets]
+        batches = [wanted[i:i + MARKETS_PAGE_SIZE] for i in range(0, len(wanted), MARKETS_PAGE_SIZE)]
+
+        async def fetch_all():
+            return await asyncio.gather(*(
+                get_async("/coins/markets", vs_currency=vs_currency, ids=",".join(batch), per_page=MARKETS_PAGE_SIZE, page=1)
+                for batch in batches
+            ))
+
+        for rows in aio.run(fetch_all()) if batches else []:
+            _remember_markets(rows, vs_currency)
+    return {coin_id: _markets[(coin_id, vs_currency)] for coin_id in coin_ids if (coin_id, vs_currency) in _markets}
+
+
+def get_top_coins(n, vs_currency='usd', ttl=UNIVERSE_TTL):
+    """/coins/markets rows of the n largest coins by market cap, largest first.
+
+    Paged 250 at a time and cached on disk for ttl seconds, so the universe stays
+    stable through the day (and rebuilds work offline). The rows also seed the
+    get_coin_markets cache.
+    """
+    path = os.path.join(UNIVERSE_CACHE_DIR, f"top_{n}_{vs_currency}.json")
+    rows = None
+    if os.path.exists(path):
+        with open(path) as f:
+            entry = json.load(f)
+        if time.time() - entry['fetched_at'] <= ttl:
+            rows = entry['data']
+
+    if rows is None:
+        rows = []
+        for page in range(1, -(-n // MARKETS_PAGE_SIZE) + 1):
+            batch = get("/coins/markets", vs_currency=vs_currency, order="market_cap_desc",
+                        per_page=MARKETS_PAGE_SIZE, page=page)
+            rows.extend(batch)
+            if len(batch) < MARKETS_PAGE_SIZE:
+                break
+        rows = rows[:n]
+        cache.write_json_atomic(path, {'fetched_at': time.time(), 'data': rows})
+
+    with _markets_lock:
+        _remember_markets(rows, vs_currency)
+    return rows
+
+
+# === Market-chart cache (memory + disk, TTL) ===
+# Read, written and evicted only on the event loop's thread, so it needs no thread lock
+_memory = {}
+_key_locks = {}
+
+
+def _cache_path(key):
+    coin_id, vs_currency, days = key
+    return os.path.join(MARKET_CHART_CACHE_DIR, f"{coin_id}_{vs_currency}_{days}.json")
+
+
+def _key_lock(key):
+    # Only used on the event loop's thread, where asyncio locks are shared by every caller
+    return _key_locks.setdefault(key, asyncio.Lock())
+
+
+def _load(key, ttl):
+    entry = _memory.get(key)
+    if entry is None:
+        path = _cache_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            entry = json.load(f)
+
+    if time.time() - entry['fetched_at'] > ttl:
+        evict(key)
+        return None
+    _memory[key] = entry
+    return entry['data']
+
+
+def _store(key, data):
+    entry = {'fetched_at': time.time(), 'data': data}
+    _memory[key] = entry
+    cache.write_json_atomic(_cache_path(key), entry)
+
+
+def evict(key):
+    _memory.pop(key, None)
+    try:
+        os.remove(_cache_path(key))
+    except FileNotFoundError:
+        pass
+
+
+def evict_expired(ttl=config.COINGECKO_CACHE_TTL):
+    """Drop every expired market chart from memory and disk (on the event loop's thread)."""
+    now = time.time()
+    for key in [key for key, entry in _memory.items() if now - entry['fetched_at'] > ttl]:
+        _memory.pop(key, None)
+    if not os.path.isdir(MARKET_CHART_CACHE_DIR):
+        return
+    for name in os.listdir(MARKET_CHART_CACHE_DIR):
+        # Leave the temporary files of writes in flight alone
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(MARKET_CHART_CACHE_DIR, name)
+        try:
+            with open(path) as f:
+                fetched_at = json.load(f)['fetched_at']
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, KeyError):
+            fetched_at = 0
+        if now - fetched_at > ttl:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+async def get_market_chart_async(coin_id, vs_currency='usd', days=365, ttl=config.COINGECKO_CACHE_TTL):
+    """Market chart for (coin_id, vs_currency, days), fetched at most once per TTL."""
+    key = (coin_id, vs_currency, days)
+    # Per-key lock: concurrent datasets asking for the same coin wait for one request
+    async with _key_lock(key):
+        data = _load(key, ttl)
+        if data is None:
+            data = await get_async(f"/coins/{coin_id}/market_chart", vs_currency=vs_currency, days=days)
+            _store(key, data)
+    return data
+
+
+def get_market_chart(coin_id, vs_currency='usd', days=365, ttl=config.COINGECKO_CACHE_TTL):
+    return aio.run(get_market_chart_async(coin_id, vs_currency, days, ttl))
+
+
+async def get_market_charts_async(coin_ids, vs_currency='usd', days=365, ttl=config.COINGECKO_CACHE_TTL):
+    evict_expired(ttl)
+    charts = await asyncio.gather(
+        *(get_market_chart_async(coin_id, vs_currency, days, ttl) for coin_id in coin_ids), return_exceptions=True
+    )
+    results = {}
+    for coin_id, chart in zip(coin_ids, charts):
+        if isinstance(chart, Exception):
+            print(f"❌ CoinGecko market chart failed for {coin_id}: {chart}")
+        else:
+            results[coin_id] = chart
+    return results
+
+
+def get_market_charts(coin_ids, vs_currency='usd', days=365, ttl=config.COINGECKO_CACHE_TTL):
+    """Returns {coin_id: market chart}; coins that fail are reported and left out.
+
+    Every coin is requested at once on the shared event loop, all drawing from
+    the CoinGecko token bucket, so throughput follows the rate limit rather
+    than the latency of one request after another. Daily history backfilled
+    with backfill_market_charts() is prepended to each chart.
+    """
+    coin_ids = list(dict.fromkeys(coin_ids))
+    charts = aio.run(get_market_charts_async(coin_ids, vs_currency, days, ttl))
+    return {coin_id: with_history(coin_id, charts[coin_id], vs_currency) for coin_id in coin_ids if coin_id in charts}
+
+
+# === Historical backfill through /market_chart/range, checkpointed per (coin, window) ===
+DAY = 24 * 60 * 60
+# CoinGecko picks the granularity from the span of the range: up to 90 days is hourly, beyond that daily.
+# Windows are (shortest, longest) spans that still get the wanted granularity.
+RANGE_WINDOWS = {
+    'hourly': (2 * DAY, 90 * DAY),
+    'daily': (91 * DAY, 365 * DAY),
+}
+CHART_SERIES = ('prices', 'market_caps', 'total_volumes')
+
+
+def range_windows(start, end, granularity):
+    """[window_start, window_end) cells of a fixed grid (multiples of the longest span) covering [start, end].
+
+    Aligning to a grid keeps the checkpoints reusable between backfills of different ranges.
+    """
+    span = RANGE_WINDOWS[granularity][1]
+    first = start // span * span
+    return [(cell, cell + span) for cell in range(first, end + 1, span)]
+
+
+def _checkpoint_path(coin_id, vs_currency, granularity, window_start):
+    return os.path.join(RANGE_CACHE_DIR, granularity, f"{coin_id}_{vs_currency}", f"{window_start}.json")
+
+
+def _load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+async def fetch_window_async(coin_id, window, vs_currency='usd', granularity='daily', now=None):
+    """Chart points of one grid cell, from its checkpoint or from /market_chart/range.
+
+    Only cells that have fully passed are checkpointed. For the cell holding
+    `now` the request is widened to the shortest span of the granularity, and
+    the extra points are cut off again.
+    """
+    now = int(now or time.time())
+    window_start, window_end = window
+    path = _checkpoint_path(coin_id, vs_currency, granularity, window_start)
+    data = _load_checkpoint(path)
+    if data is not None:
+        return data
+
+    shortest = RANGE_WINDOWS[granularity][0]
+    to_ts = min(window_end - 1, now)
+    from_ts = min(window_start, to_ts - shortest)
+    chart = await get_async(f"/coins/{coin_id}/market_chart/range", vs_currency=vs_currency, **{'from': from_ts, 'to': to_ts})
+    data = {
+        series: [point for point in chart.get(series, []) if window_start * 1000 <= point[0] < window_end * 1000]
+        for series in CHART_SERIES
+    }
+
+    if window_end <= now:
+        cache.write_json_atomic(path, data)
+    return data
+
+
+def merge_charts(*charts):
+    """Union of market charts: points sorted by timestamp, the first chart's point winning on duplicates."""
+    merged = {}
+    for series in CHART_SERIES:
+        points = {}
+        for chart in charts:
+            for point in chart.get(series, []):
+                points.setdefault(point[0], point)
+        merged[series] = [points[timestamp] for timestamp in sorted(points)]
+    return merged
+
+
+def backfill_market_charts(coin_ids, start, end=None, vs_currency='usd', granularity='daily'):
+    """Market charts for [start, end] (unix seconds) at the given granularity.
+
+    Every (coin, window) pair is requested at once on the shared event loop,
+    under the CoinGecko rate limit, and each finished window is checkpointed, so
+    an interrupted backfill picks up where it stopped. Returns
+    ({coin_id: chart}, complete); complete is False if any window failed (coins
+    with a failed window are left out).
+    """
+    now = int(time.time())
+    end = min(int(end or now), now)
+    coin_ids = list(dict.fromkeys(coin_ids))
+    windows = range_windows(int(start), end, granularity)
+    cells = [(coin_id, window) for coin_id in coin_ids for window in windows]
+
+    async def fetch_all():
+        return await asyncio.gather(*(
+            fetch_window_async(coin_id, window, vs_currency=vs_currency, granularity=granularity, now=now)
+            for coin_id, window in cells
+        ), return_exceptions=True)
+
+    results, failed = {}, set()
+    for (coin_id, window), data in zip(cells, aio.run(fetch_all())):
+        if isinstance(data, Exception):
+            print(f"❌ CoinGecko backfill failed for {coin_id} {window[0]}-{window[1]}: {data}")
+            failed.add(coin_id)
+        else:
+            results[coin_id, window] = data
+    print(f"📈 Backfilled {len(coin_ids) - len(failed)}/{len(coin_ids)} coins over {len(windows)} {granularity} windows")
+
+    charts = {}
+    for coin_id in coin_ids:
+        if coin_id in failed:
+            continue
+        chart = merge_charts(*(results[coin_id, window] for window in windows))
+        charts[coin_id] = {
+            series: [point for point in points if start * 1000 <= point[0] <= end * 1000]
+            for series, points in chart.items()
+        }
+    return charts, not failed
+
+
+def backfilled_history(coin_id, vs_currency='usd', granularity='daily'):
+    """Every checkpointed window of coin_id merged into one chart (empty if never backfilled)."""
+    directory = os.path.dirname(_checkpoint_path(coin_id, vs_currency, granularity, 0))
+    if not os.path.isdir(directory):
+        return None
+    windows = [_load_checkpoint(os.path.join(directory, name)) for name in os.listdir(directory) if name.endswith(".json")]
+    return merge_charts(*windows) if windows else None
+
+
+def with_history(coin_id, chart, vs_currency='usd'):
+    """chart with any backfilled daily history before its first point prepended."""
+    history = backfilled_history(coin_id, vs_currency)
+    if history is None or not chart.get('prices'):
+        return chart
+    first = chart['prices'][0][0]
+    return {
+        **chart,
+        **{series: [point for point in history[series] if point[0] < first] + chart.get(series, []) for series in CHART_SERIES},
+    }
@@ -0,0 +1,49 @@
+import os
+
+# === Secrets ===
+FRED_API_KEY = os.getenv("FRED_API_KEY")
+DUNE_API_KEY = os.getenv("DUNE_API_KEY")
+COINDESK_API_KEY = os.getenv("COINDESK_API_KEY")
+
+# === Endpoints ===
+DUNE_UPLOAD_URL = os.getenv("DUNE_UPLOAD_URL", "https://api.dune.com/api/v1/table/upload/csv")
+DUNE_UPLOAD_GZIP = os.getenv("DUNE_UPLOAD_GZIP", "1") != "0"
+FRED_OBSERVATIONS_URL = "https://api.stlouisfed.org/fred/series/observations"
+FRED_SERIES_URL = "https://api.stlouisfed.org/fred/series"
+FRED_VINTAGE_DATES_URL = "https://api.stlouisfed.org/fred/series/vintagedates"
+COINDESK_ARTICLES_URL = "https://data-api.coindesk.com/news/v1/article/list"
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+
+# === HTTP ===
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30))
+# Connections open at once across every provider and Dune (one pool on the shared event loop)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+DUNE_UPLOAD_TIMEOUT = float(os.getenv("DUNE_UPLOAD_TIMEOUT", 300))
+
+# === Local cache (kept between runs) ===
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.getenv("PIPELINE_CACHE_DIR", os.path.join(REPO_DIR, ".cache"))
+# Columnar history of every Dune table (the source of truth for uploads)
+STORE_DIR = os.getenv("PIPELINE_STORE_DIR", os.path.join(REPO_DIR, ".store"))
+# Per-stage timing spans (spans.jsonl) and Prometheus textfiles (<dataset>.prom)
+METRICS_DIR = os.getenv("PIPELINE_METRICS_DIR", os.path.join(REPO_DIR, ".metrics"))
+# spans.jsonl is rotated to spans.jsonl.1 once it grows past this size
+METRICS_MAX_BYTES = int(os.getenv("PIPELINE_METRICS_MAX_BYTES", 64 * 1024 * 1024))
+# Source files checked into the repo (TradingView exports, RBI workbooks)
+DATA_DIR = os.getenv("PIPELINE_DATA_DIR", os.path.join(REPO_DIR, "data"))
+
+# FRED series are kept current by vintage: each run requests only the observations added or revised
+# since the cached vintage (0: re-request from the last cached date, which misses older revisions)
+FRED_TRACK_REVISIONS = os.getenv("FRED_TRACK_REVISIONS", "1") != "0"
+
+# Market charts are reused for just under an hour, so the hourly run refreshes them once
+COINGECKO_CACHE_TTL = int(os.getenv("COINGECKO_CACHE_TTL", 55 * 60))
+
+# Coin universe of the CoinGecko datasets: 0 keeps the tracked coins in the registry,
+# N > 0 uses the top N coins by market cap (re-ranked once a day)
+COINGECKO_TOP_N = int(os.getenv("COINGECKO_TOP_N", 0))
+# Requests per second allowed by the CoinGecko plan (the free tier is ~30 / minute)
+COINGECKO_RATE_LIMIT = float(os.getenv("COINGECKO_RATE_LIMIT", 0.5))
+
+# How far back the first CoinDesk run (empty cache) backfills
+COINDESK_BACKFILL_DAYS = int(os.getenv("COINDESK_BACKFILL_DAYS", 90))
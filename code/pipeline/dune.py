@@ -0,0 +1,134 @@
+import hashlib
+import json
+import zlib
+
+import pandas as pd
+
+from . import aio, config, ratelimit, schema
+
+UPLOAD_CHUNK_ROWS = 50_000
+# ...and roughly this much CSV per chunk at most, for tables with long text columns
+UPLOAD_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Flipped off for the rest of the process if Dune refuses a gzip-encoded body
+_gzip_enabled = config.DUNE_UPLOAD_GZIP
+
+
+# === Streaming payload ===
+def chunk_rows_for(df: pd.DataFrame):
+    """Rows per CSV chunk: UPLOAD_CHUNK_ROWS, fewer when rows are wide enough to exceed UPLOAD_CHUNK_BYTES."""
+    if df.empty:
+        return UPLOAD_CHUNK_ROWS
+    row_bytes = df.memory_usage(index=False, deep=True).sum() / len(df)
+    return int(min(UPLOAD_CHUNK_ROWS, max(UPLOAD_CHUNK_BYTES // max(row_bytes, 1), 1)))
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = None, float_formats: dict = None):
+    """Yield the frame as CSV text, chunk_rows rows at a time (header only on the first chunk).
+
+    float_formats ({column: printf format}) writes those float columns with fewer digits.
+    """
+    chunk_rows = chunk_rows or chunk_rows_for(df)
+    formats = {column: fmt for column, fmt in (float_formats or {}).items() if column in df.columns}
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if formats:
+            chunk = chunk.assign(**{column: schema.format_floats(chunk[column], fmt) for column, fmt in formats.items()})
+        yield chunk.to_csv(index=False, header=start == 0)
+
+
+def content_digest(df: pd.DataFrame, table_name: str, description: str, float_formats: dict = None):
+    """Stable sha256 of exactly what an upload would send, plus the CSV size in bytes."""
+    digest = hashlib.sha256(json.dumps([table_name, description]).encode())
+    csv_bytes = 0
+    for chunk in iter_csv_chunks(df, float_formats=float_formats):
+        encoded = chunk.encode()
+        csv_bytes += len(encoded)
+        digest.update(encoded)
+    return digest.hexdigest(), csv_bytes
+
+
+def iter_payload(df: pd.DataFrame, table_name: str, description: str, stats: dict, float_formats: dict = None):
+    """Yield the upload JSON body piece by piece, JSON-escaping each CSV chunk as it is produced."""
+    head = json.dumps({
+        "description": description,
+        "table_name": table_name,
+        "is_private": False
+    })
+    yield (head[:-1] + ', "data": "').encode()
+    for chunk in iter_csv_chunks(df, float_formats=float_formats):
+        encoded = chunk.encode()
+        stats['csv_bytes'] += len(encoded)
+        yield json.dumps(chunk, ensure_ascii=False)[1:-1].encode()
+    yield b'"}'
+
+
+def gzip_stream(chunks, stats: dict):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            stats['sent_bytes'] += len(compressed)
+            yield compressed
+    compressed = compressor.flush()
+    stats['sent_bytes'] += len(compressed)
+    yield compressed
+
+
+def plain_stream(chunks, stats: dict):
+    for chunk in chunks:
+        stats['sent_bytes'] += len(chunk)
+        yield chunk
+
+
+# === Upload CSV to Dune ===
+def _rejects_gzip(response):
+    """415, or a 400 blaming the encoding; any other 400 is a real error in the upload itself."""
+    if response.status_code == 415:
+        return True
+    body = response.content.decode(errors='replace').lower()
+    return response.status_code == 400 and any(word in body for word in ('gzip', 'encoding', 'compress'))
+
+
+async def upload_csv_to_dune_async(df: pd.DataFrame, table_name: str, description: str, api_key: str = None,
+                                   float_formats: dict = None):
+    """Stream df to Dune's CSV upload endpoint over the shared connection pool; returns {'csv_bytes', 'sent_bytes'}."""
+    global _gzip_enabled
+
+    async def send(use_gzip):
+        # The body is a one-shot generator, so every retry rebuilds it from the frame
+        result = {}
+
+        async def attempt():
+            stats = result['stats'] = {'csv_bytes': 0, 'sent_bytes': 0}
+            headers = {
+                "X-DUNE-API-KEY": api_key or config.DUNE_API_KEY,
+                "Content-Type": "application/json"
+            }
+            body = iter_payload(df, table_name, description, stats, float_formats)
+            if use_gzip:
+                headers["Content-Encoding"] = "gzip"
+                body = gzip_stream(body, stats)
+            else:
+                body = plain_stream(body, stats)
+            # CSV chunks are built and compressed off the loop's thread, one at a time as the socket takes them
+            return await aio.send("POST", config.DUNE_UPLOAD_URL, data=aio.iterate(body), headers=headers,
+                                  timeout=config.DUNE_UPLOAD_TIMEOUT)
+
+        response = await ratelimit.call('dune', attempt)
+        return response, result['stats']
+
+    response, stats = await send(_gzip_enabled)
+    if _gzip_enabled and _rejects_gzip(response):
+        print(f"⚠️ Dune rejected the gzip upload ({response.status_code}), retrying uncompressed")
+        _gzip_enabled = False
+        response, stats = await send(False)
+
+    response.raise_for_status()
+    print("✅ Uploaded to Dune:", table_name)
+    return stats
+
+
+def upload_csv_to_dune(df: pd.DataFrame, table_name: str, description: str, api_key: str = None,
+                       float_formats: dict = None):
+    return aio.run(upload_csv_to_dune_async(df, table_name, description, api_key, float_formats))
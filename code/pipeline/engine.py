@@ -0,0 +1,250 @@
+import concurrent.futures
+import contextlib
+import dataclasses
+import time
+import traceback
+
+from datetime import datetime, timezone
+
+from . import coingecko, indicators, journal, schedule, schema, store, telemetry
+from .dune import content_digest, upload_csv_to_dune
+from .registry import DATASETS, get_dataset
+from .sources import BATCH_FETCHERS, FETCHERS, with_circulating_supply
+
+
+# === Batch prefetch: one call per source for all selected datasets ===
+def prefetch(datasets):
+    prefetched = {}
+    for source, batch_fetch in BATCH_FETCHERS.items():
+        ids = [id_ for dataset in datasets if dataset.source == source for id_ in dataset.resolve_ids()]
+        if not ids:
+            continue
+        start = time.perf_counter()
+        try:
+            with telemetry.span('prefetch', source=source, ids=len(ids)):
+                prefetched[source] = batch_fetch(ids)
+        except Exception as e:
+            # Datasets fall back to fetching on their own
+            print(f"❌ Batch fetch for {source} failed: {e}")
+            continue
+        print(f"Prefetched {len(prefetched[source])} {source} ids in {time.perf_counter() - start:.1f}s")
+    telemetry.write_prometheus(None)
+    return prefetched
+
+
+def fetch(dataset, prefetched=None):
+    batch = (prefetched or {}).get(dataset.source)
+    with telemetry.span('fetch') as current:
+        ids = dataset.resolve_ids()
+        current.set(ids=len(ids))
+        if batch is not None and all(id_ in batch for id_ in ids):
+            current.set(prefetched=True)
+            return {id_: batch[id_] for id_ in ids}
+        return FETCHERS[dataset.source](ids)
+
+
+@contextlib.contextmanager
+def _instrumented(dataset, kind):
+    """Wrap a whole dataset run in a span and write its Prometheus textfile when it ends."""
+    try:
+        with telemetry.span(kind, dataset.name):
+            yield
+    finally:
+        telemetry.write_prometheus(dataset.name)
+
+
+def upload_stored(dataset, force=False):
+    """Upload the stored table (memory-mapped from the local store) to Dune.
+
+    Skipped when its content hash matches the last successful upload, unless forced.
+    """
+    df = store.read_table(dataset.name)
+    if df is None:
+        raise RuntimeError(f"Nothing stored for {dataset.name}; run the dataset first")
+
+    float_formats = schema.float_formats(dataset.schema, dataset.indicators)
+    with telemetry.span('serialize', rows=len(df)) as current:
+        digest, csv_bytes = content_digest(df, dataset.name, dataset.description, float_formats)
+        current.set(bytes=csv_bytes)
+    last = store.last_upload(dataset.name)
+    if not force and last is not None and last['sha256'] == digest:
+        print(f"⏭️ {dataset.name} unchanged since last upload, skipping")
+        return {'skipped': True, 'sha256': digest, 'csv_bytes': csv_bytes, 'sent_bytes': 0}
+
+    with telemetry.span('upload', rows=len(df)) as current:
+        stats = upload_csv_to_dune(df, dataset.name, dataset.description, float_formats=float_formats)
+        current.set(bytes=stats['sent_bytes'], csv_bytes=stats['csv_bytes'])
+    store.record_upload(dataset.name, digest, csv_bytes)
+    return {'skipped': False, 'sha256': digest, **stats}
+
+
+# === Run a single dataset: fetch -> transform -> upload, each stage through the store ===
+def run_dataset(dataset, upload=True, prefetched=None):
+    if isinstance(dataset, str):
+        dataset = get_dataset(dataset)
+
+    with journal.exclusive(dataset.name):
+        # The dataset is as fresh as the start of its fetch: a release landing after that is still due
+        fetched_at = datetime.now(timezone.utc)
+        with _instrumented(dataset, 'run'):
+            journal.begin(dataset.name)
+            with journal.stage(dataset.name, 'fetch') as output:
+                raw = fetch(dataset, prefetched)
+                output['sha256'] = store.write_raw(dataset.name, raw)
+                output['started_at'] = fetched_at.timestamp()
+            result = _transform_and_upload(dataset, raw, upload)
+        journal.finish(dataset.name)
+        schedule.record_runs([dataset.name], when=fetched_at)
+    return result
+
+
+def _transform_and_upload(dataset, raw, upload_table):
+    """Returns {'rows', 'store', 'upload'} for the run report."""
+    with journal.stage(dataset.name, 'transform') as output, telemetry.span('transform') as current:
+        df = schema.apply(dataset.transform(raw), dataset.schema)
+        df = indicators.extend(dataset.name, df, dataset.indicators)
+        current.set(rows=len(df))
+        output.update(rows=len(df), columns=list(df.columns))
+    with journal.stage(dataset.name, 'store') as output, telemetry.span('store') as current:
+        mode, rows = store.write_table(dataset.name, df)
+        current.set(rows=rows, mode=mode)
+        output.update(mode=mode, rows=rows)
+    print(f"💾 Stored {dataset.name}: {mode} ({rows} rows)")
+    result = {'rows': len(df), 'store': mode, 'upload': None}
+    if upload_table:
+        result['upload'] = _journaled_upload(dataset)
+    return result
+
+
+def _journaled_upload(dataset):
+    with journal.stage(dataset.name, 'upload') as output:
+        stats = upload_stored(dataset)
+        output.update(sha256=stats['sha256'], skipped=stats['skipped'])
+    return stats
+
+
+# === Work from the store only (no provider requests) ===
+def rebuild_dataset(dataset, upload=True):
+    """Re-run the transform on the last stored fetch output."""
+    if isinstance(dataset, str):
+        dataset = get_dataset(dataset)
+    with journal.exclusive(dataset.name):
+        raw = store.read_raw(dataset.name)
+        if raw is None:
+            raise RuntimeError(f"No stored fetch output for {dataset.name}; run the dataset first")
+        with _instrumented(dataset, 'rebuild'):
+            result = _transform_and_upload(dataset, raw, upload)
+        journal.finish(dataset.name)
+    return result
+
+
+def reupload_dataset(dataset):
+    if isinstance(dataset, str):
+        dataset = get_dataset(dataset)
+    with journal.exclusive(dataset.name), _instrumented(dataset, 'reupload'):
+        return upload_stored(dataset, force=True)
+
+
+# === Resume a failed or interrupted run from its journal ===
+def resume_dataset(dataset):
+    """Redo only the stages the dataset's last run did not complete, reusing its stored fetch output."""
+    if isinstance(dataset, str):
+        dataset = get_dataset(dataset)
+    with journal.exclusive(dataset.name):
+        entry = journal.read_journal().get(dataset.name, {})
+        stage = journal.resume_stage(entry)
+        raw = store.read_raw(dataset.name) if stage in ('transform', 'upload') else None
+        if stage == 'fetch' or (stage == 'transform' and raw is None):
+            return run_dataset(dataset)
+
+        print(f"↩️ Resuming {dataset.name} at {stage}")
+        with _instrumented(dataset, 'resume'):
+            if stage == 'transform':
+                result = _transform_and_upload(dataset, raw, upload_table=True)
+            else:
+                table = store.read_arrow(dataset.name)
+                result = {'rows': table.num_rows if table is not None else 0, 'store': 'unchanged', 'upload': _journaled_upload(dataset)}
+        journal.finish(dataset.name)
+        # The data is as fresh as its fetch, so that is when the dataset counts as run
+        fetch_stage = entry['stages']['fetch']
+        schedule.record_runs([dataset.name], when=datetime.fromtimestamp(fetch_stage.get('started_at', fetch_stage['at']), timezone.utc))
+    return result
+
+
+def resume_datasets(names=None, max_workers=4):
+    return run_datasets(names, max_workers=max_workers, runner=resume_dataset)
+
+
+# === Run many datasets inside this process ===
+def run_datasets(names=None, max_workers=4, runner=None):
+    datasets = DATASETS if names is None else [get_dataset(name) for name in names]
+    prefetched = prefetch(datasets) if runner is None else None
+    runner = runner or (lambda dataset: run_dataset(dataset, prefetched=prefetched))
+    results = {}
+
+    def run(dataset):
+        start = time.perf_counter()
+        print(f"Running dataset: {dataset.name}")
+        try:
+            result = runner(dataset)
+        except journal.Busy as e:
+            print(f"⏳ Skipping {e}")
+            return {'status': 'busy', 'error': str(e), 'seconds': time.perf_counter() - start}
+        except Exception as e:
+            traceback.print_exc()
+            print(f"❌ Error in dataset {dataset.name}: {e}")
+            return {'status': 'failed', 'error': str(e), 'seconds': time.perf_counter() - start}
+        print(f"Dataset {dataset.name} completed successfully.")
+        return {'status': 'ok', **result, 'seconds': time.perf_counter() - start}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, dataset): dataset.name for dataset in datasets}
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return results
+
+
+# === Historical backfill of the CoinGecko chart datasets ===
+BACKFILL_SOURCES = ('coingecko_chart', 'coingecko_market_cap')
+
+
+def backfill_datasets(start, end=None, names=None, granularity='daily', upload=True):
+    """Backfill the CoinGecko chart datasets over [start, end] (unix seconds) via /market_chart/range.
+
+    Daily history is checkpointed and then carried by every regular run of the
+    datasets, which are run right away. Hourly history goes to separate
+    <table>_hourly tables. Re-running after an interruption resumes from the
+    checkpointed (coin, window) pairs.
+    """
+    datasets = [
+        dataset for dataset in (DATASETS if names is None else [get_dataset(name) for name in names])
+        if dataset.source in BACKFILL_SOURCES
+    ]
+    coin_ids = list(dict.fromkeys(id_ for dataset in datasets for id_ in dataset.resolve_ids()))
+    with telemetry.span('backfill_fetch', source='coingecko', granularity=granularity, ids=len(coin_ids)):
+        charts, complete = coingecko.backfill_market_charts(coin_ids, start, end, granularity=granularity)
+    telemetry.write_prometheus(None)
+    if not complete:
+        raise RuntimeError("CoinGecko backfill incomplete; run it again to resume from the checkpoints")
+
+    if granularity == 'daily':
+        return run_datasets([dataset.name for dataset in datasets])
+
+    results = {}
+    for dataset in datasets:
+        variant = dataclasses.replace(
+            dataset, name=f"{dataset.name}_{granularity}", description=f"{dataset.description} ({granularity} history)"
+        )
+        ids = dataset.resolve_ids()
+        raw = {coin_id: charts[coin_id] for coin_id in ids if coin_id in charts}
+        if dataset.source == 'coingecko_market_cap':
+            raw = with_circulating_supply(ids, raw)
+        with journal.exclusive(variant.name):
+            with _instrumented(variant, 'backfill'):
+                journal.begin(variant.name)
+                with journal.stage(variant.name, 'fetch') as output:
+                    output['sha256'] = store.write_raw(variant.name, raw)
+                results[variant.name] = _transform_and_upload(variant, raw, upload)
+            journal.finish(variant.name)
+    return results
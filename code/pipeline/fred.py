@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import time
+
+import pandas as pd
+
+from . import aio, cache, config
+
+FRED_CACHE_DIR = os.path.join(config.CACHE_DIR, "fred")
+# Past this many new vintages, one full download is cheaper than a request per vintage
+MAX_VINTAGE_REQUESTS = 30
+
+
+# === Observations (requests run on the shared event loop, see aio) ===
+async def fetch_observations_async(series_id, observation_start=None):
+    params = {
+        "series_id": series_id,
+        "api_key": config.FRED_API_KEY,
+        "file_type": "json",
+    }
+    if observation_start is not None:
+        params["observation_start"] = pd.Timestamp(observation_start).strftime('%Y-%m-%d')
+
+    observations = (await aio.get_json('fred', config.FRED_OBSERVATIONS_URL, **params)).get("observations", [])
+
+    # FRED reports missing values as "."
+    return pd.Series(
+        pd.to_numeric([obs["value"] for obs in observations], errors='coerce'),
+        index=pd.to_datetime([obs["date"] for obs in observations]),
+        dtype=float,
+    )
+
+
+def fetch_observations(series_id, observation_start=None):
+    return aio.run(fetch_observations_async(series_id, observation_start))
+
+
+# === Series metadata (frequency, last_updated) ===
+def _info_path(series_id):
+    return os.path.join(FRED_CACHE_DIR, "meta", f"{series_id}.json")
+
+
+def get_series_info(series_id, max_age=0):
+    """FRED series metadata, reusing the copy on disk if it is younger than max_age seconds."""
+    path = _info_path(series_id)
+    if os.path.exists(path):
+        with open(path) as f:
+            cached = json.load(f)
+        if time.time() - cached['fetched_at'] <= max_age:
+            return cached['info']
+
+    params = {"series_id": series_id, "api_key": config.FRED_API_KEY, "file_type": "json"}
+    info = aio.run(aio.get_json('fred', config.FRED_SERIES_URL, **params))["seriess"][0]
+
+    cache.write_json_atomic(path, {'fetched_at': time.time(), 'info': info})
+    return info
+
+
+# === Local observation cache ===
+def _cache_path(series_id):
+    return os.path.join(FRED_CACHE_DIR, f"{series_id}.csv")
+
+
+# === Vintages (ALFRED): the dates FRED published new or revised observations of a series ===
+def _vintage_path(series_id):
+    return os.path.join(FRED_CACHE_DIR, "vintages", f"{series_id}.json")
+
+
+def read_vintage(series_id):
+    """The vintage the cached history is current as of ('YYYY-MM-DD'), or None."""
+    path = _vintage_path(series_id)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['vintage']
+
+
+def write_vintage(series_id, vintage):
+    cache.write_json_atomic(_vintage_path(series_id), {'vintage': vintage})
+
+
+async def fetch_vintage_dates_async(series_id, realtime_start=None, latest_only=False):
+    """Vintage dates of a series from realtime_start on, oldest first (just the latest with latest_only)."""
+    params = {
+        "series_id": series_id,
+        "api_key": config.FRED_API_KEY,
+        "file_type": "json",
+        "realtime_start": realtime_start,
+        "realtime_end": "9999-12-31",
+    }
+    if latest_only:
+        params.update(sort_order="desc", limit=1)
+    vintages = (await aio.get_json('fred', config.FRED_VINTAGE_DATES_URL, **params)).get("vintage_dates", [])
+    return sorted(vintages)
+
+
+async def fetch_vintage_async(series_id, vintage):
+    """Observations added or revised in one vintage (output_type=3).
+
+    The vintage's values come in a "<series_id>_<YYYYMMDD>" field. Only observations the vintage
+    changed are listed, so a "." there is a real missing value, not an unchanged one; that only
+    holds for one vintage per request, which is why vintages are not batched.
+    """
+    params = {
+        "series_id": series_id,
+        "api_key": config.FRED_API_KEY,
+        "file_type": "json",
+        "output_type": 3,
+        "vintage_dates": vintage,
+    }
+    observations = (await aio.get_json('fred', config.FRED_OBSERVATIONS_URL, **params)).get("observations", [])
+    values = [next((value for key, value in obs.items() if key not in ("date", "realtime_start", "realtime_end")), ".")
+              for obs in observations]
+    return pd.Series(
+        pd.to_numeric(values, errors='coerce'),
+        index=pd.to_datetime([obs["date"] for obs in observations]),
+        dtype=float,
+    )
+
+
+# === First-release dates: when each observation was first published (for as-of joins) ===
+def _releases_path(series_id):
+    return os.path.join(FRED_CACHE_DIR, "releases", f"{series_id}.csv")
+
+
+async def fetch_release_dates_async(series_id):
+    """The first-release date of every observation (ALFRED's initial releases, output_type=4)."""
+    params = {
+        "series_id": series_id,
+        "api_key": config.FRED_API_KEY,
+        "file_type": "json",
+        "output_type": 4,
+        "realtime_start": "1776-07-04",
+        "realtime_end": "9999-12-31",
+    }
+    observations = (await aio.get_json('fred', config.FRED_OBSERVATIONS_URL, **params)).get("observations", [])
+    return pd.Series(
+        pd.to_datetime([obs["realtime_start"] for obs in observations]),
+        index=pd.to_datetime([obs["date"] for obs in observations]),
+    ).sort_index()
+
+
+def release_dates(series_id):
+    """Date each cached observation was first published, or None when they were not tracked.
+
+    ALFRED's first vintage of a series holds all the history published before it was recorded;
+    those observations get the series' median release lag (over later observations) after their
+    date, capped at that first vintage.
+    """
+    released = cache.load_series(_releases_path(series_id), 'released')
+    if released is None or released.empty:
+        return None
+    released = pd.to_datetime(released)
+    first_vintage = released.min()
+    backfilled = (released == first_vintage).to_numpy()
+    lags = released[~backfilled] - released.index[~backfilled]
+    lag = lags.median() if len(lags) else pd.Timedelta(0)
+    estimated = pd.Series(released.index[backfilled] + lag, index=released.index[backfilled])
+    released[backfilled] = estimated.clip(upper=first_vintage)
+    return released
+
+
+# === Incremental fetch ===
+async def _update_by_watermark(series_id, cached):
+    # The watermark observation itself is re-requested so a revision to the latest value is picked up
+    new = await fetch_observations_async(series_id, observation_start=cache.watermark(cached))
+    data = cache.merge_observations(cached, new)
+    if cached is None or not new.empty:
+        cache.save_series(_cache_path(series_id), data, 'value')
+    return data
+
+
+def _untracked(series_id):
+    """Whether ALFRED listed no vintages for the series (recorded as a null vintage)."""
+    return os.path.exists(_vintage_path(series_id)) and read_vintage(series_id) is None
+
+
+async def _full_history(series_id):
+    # The latest vintage is read before the history, so one published in between is applied (again) next run
+    latest = await fetch_vintage_dates_async(series_id, latest_only=True)
+    if not latest:
+        print(f"⚠️ {series_id}: ALFRED lists no vintages, keeping it current by date (watermark) instead")
+        write_vintage(series_id, None)
+        return await _update_by_watermark(series_id, None)
+    data, released = await asyncio.gather(fetch_observations_async(series_id), fetch_release_dates_async(series_id))
+    data = data.sort_index()
+    cache.save_series(_cache_path(series_id), data, 'value')
+    cache.save_series(_releases_path(series_id), released, 'released')
+    write_vintage(series_id, latest[-1])
+    return data
+
+
+async def _update_by_vintage(series_id, cached):
+    if cached is not None and _untracked(series_id):
+        return await _update_by_watermark(series_id, cached)
+    vintage = read_vintage(series_id)
+    if cached is None or vintage is None:
+        return await _full_history(series_id)
+
+    released = cache.load_series(_releases_path(series_id), 'released')
+    if released is None:
+        # Tracked before release dates were kept
+        released = await fetch_release_dates_async(series_id)
+        cache.save_series(_releases_path(series_id), released, 'released')
+
+    vintages = [v for v in await fetch_vintage_dates_async(series_id, realtime_start=vintage) if v > vintage]
+    if not vintages:
+        return cached
+    if len(vintages) > MAX_VINTAGE_REQUESTS:
+        print(f"🔁 {series_id}: {len(vintages)} vintages behind, downloading the full history instead")
+        return await _full_history(series_id)
+    changes = await asyncio.gather(*(fetch_vintage_async(series_id, v) for v in vintages))
+    data = cached
+    released = pd.to_datetime(released)
+    for vintage, changed in zip(vintages, changes):
+        data = cache.merge_observations(data, changed)
+        # An observation is released by the first vintage holding it; revisions keep that date
+        new = changed.index[~changed.index.isin(released.index)]
+        released = pd.concat([released, pd.Series(pd.Timestamp(vintage), index=new)]).sort_index()
+    print(f"🔁 {series_id}: {sum(len(changed) for changed in changes)} observations new or revised "
+          f"in {len(vintages)} vintages")
+    cache.save_series(_cache_path(series_id), data, 'value')
+    cache.save_series(_releases_path(series_id), released, 'released')
+    write_vintage(series_id, vintages[-1])
+    return data
+
+
+async def get_series_async(series_id):
+    """Return the full history of a FRED series, from a local copy brought up to date.
+
+    With config.FRED_TRACK_REVISIONS, only the observations added or revised in vintages
+    published since the cached one are requested (a full download when it is more than
+    MAX_VINTAGE_REQUESTS behind). Otherwise, or for a series ALFRED has no vintages of,
+    observations are requested from the last cached date (the watermark) onward, which
+    misses revisions to older ones.
+    """
+    cached = cache.load_series(_cache_path(series_id), 'value')
+    if config.FRED_TRACK_REVISIONS:
+        return await _update_by_vintage(series_id, cached)
+    return await _update_by_watermark(series_id, cached)
+
+
+def get_series(series_id):
+    return aio.run(get_series_async(series_id))
+
+
+# === Concurrent batch fetch ===
+async def get_series_many_async(series_ids):
+    series_ids = list(dict.fromkeys(series_ids))
+    fetched = await asyncio.gather(*(get_series_async(series_id) for series_id in series_ids), return_exceptions=True)
+    results = {}
+    for series_id, data in zip(series_ids, fetched):
+        if isinstance(data, Exception):
+            print(f"❌ FRED fetch failed for {series_id}: {data}")
+        else:
+            results[series_id] = data
+    return results
+
+
+def get_series_many(series_ids):
+    """Fetch several series at once on the shared event loop.
+
+    Returns {series_id: Series}; series that fail are reported and left out so
+    one bad id does not sink the whole batch.
+    """
+    return aio.run(get_series_many_async(series_ids))
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from . import store
+
+
+# === Indicators: update(values, state) -> (output for the new rows, state after them);
+# state_at(table, row) -> the state after the first `row` rows of a stored table ===
+@dataclass(frozen=True)
+class EMA:
+    """Exponential moving average (no bias adjustment; missing values are skipped).
+    State: the last average."""
+    column: str
+    span: int
+
+    @property
+    def name(self):
+        return f"{self.column}_ema_{self.span}"
+
+    def update(self, values, state=None):
+        # Seeding the series with the previous average continues the recursion exactly
+        seeded = values if state is None else np.concatenate([[state], values])
+        out = pd.Series(seeded).ewm(span=self.span, adjust=False, ignore_na=True).mean().to_numpy()
+        out = out if state is None else out[1:]
+        valid = out[~np.isnan(out)]
+        return out, (float(valid[-1]) if len(valid) else state)
+
+    def state_at(self, table, row):
+        """The state after the first `row` rows of a table holding this indicator: its last average."""
+        previous = table.column(self.name).slice(0, row).to_numpy(zero_copy_only=False).astype(float)
+        valid = previous[~np.isnan(previous)]
+        return float(valid[-1]) if len(valid) else None
+
+
+@dataclass(frozen=True)
+class Rolling:
+    """Rolling mean / standard deviation over full windows. State: the last window - 1 values."""
+    column: str
+    window: int
+    stat: str = 'mean'  # 'mean' or 'std'
+
+    @property
+    def name(self):
+        return f"{self.column}_{'sma' if self.stat == 'mean' else self.stat}_{self.window}"
+
+    def update(self, values, state=None):
+        tail = np.asarray(state if state is not None else [], dtype=float)
+        window = np.concatenate([tail, values])
+        rolling = pd.Series(window).rolling(self.window, min_periods=self.window)
+        out = getattr(rolling, self.stat)().to_numpy()[len(tail):]
+        return out, window[max(len(window) - self.window + 1, 0):].tolist()
+
+    def state_at(self, table, row):
+        """The state after the first `row` rows of a table holding this indicator: the input values before it."""
+        previous = table.column(self.column).slice(max(row - self.window + 1, 0), min(row, self.window - 1))
+        return previous.to_numpy(zero_copy_only=False).astype(float).tolist()
+
+
+def RollingMean(column, window):
+    return Rolling(column, window, 'mean')
+
+
+def RollingStd(column, window):
+    return Rolling(column, window, 'std')
+
+
+# === Resuming from the stored table ===
+def _first_change(df, stored):
+    """Number of leading rows df shares with the stored table (0 when their columns don't line up)."""
+    base = [column for column in stored.column_names if column in df.columns]
+    rows = min(len(df), stored.num_rows)
+    new = pa.Table.from_pandas(df[base].iloc[:rows], preserve_index=False)
+    old = stored.select(base).slice(0, rows)
+    if not base or not new.schema.equals(old.schema, check_metadata=False):
+        return 0
+    for column in base:
+        a, b = new.column(column), old.column(column)
+        differs = pc.invert(pc.or_(pc.fill_null(pc.equal(a, b), False), pc.and_(pc.is_null(a), pc.is_null(b))))
+        changed = pc.index(differs, True).as_py()
+        if changed != -1:
+            rows = min(rows, changed)
+    return rows
+
+
+def extend(name, df, indicators):
+    """df with one column per indicator, only computing the rows from the first one that changed.
+
+    Rows before it keep their stored indicator values, and each indicator's state is
+    rebuilt from the stored table at that row: a run that appends rows or revises
+    the last few computes just those.
+    """
+    if not indicators:
+        return df
+    stored = store.read_arrow(name)
+    rows = 0
+    if stored is not None and all(indicator.name in stored.column_names for indicator in indicators):
+        rows = _first_change(df, stored)
+    df = df.copy()
+    for indicator in indicators:
+        values = df[indicator.column].iloc[rows:].to_numpy(dtype=float)
+        out, _ = indicator.update(values, indicator.state_at(stored, rows) if rows else None)
+        if rows:
+            out = np.concatenate([stored.column(indicator.name).slice(0, rows).to_numpy(zero_copy_only=False), out])
+        df[indicator.name] = out
+    return df
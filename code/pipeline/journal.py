@@ -0,0 +1,132 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+from . import cache, config, telemetry
+
+# Stages of a dataset run, in order. Each completed stage is journaled with a digest of its output,
+# so a failed run can resume from the first stage that did not complete.
+STAGES = ('fetch', 'transform', 'store', 'upload')
+
+_held = threading.local()
+
+
+class Busy(RuntimeError):
+    """The dataset is being run by another process (or thread)."""
+
+
+# === <STORE_DIR>/_journal.json: {dataset: {run_id, status, stages: {stage: output}, failed_stage, error}} ===
+def _journal_path():
+    return os.path.join(config.STORE_DIR, "_journal.json")
+
+
+def read_journal():
+    if not os.path.exists(_journal_path()):
+        return {}
+    with open(_journal_path()) as f:
+        return json.load(f)
+
+
+def _update(name, change):
+    # Locked across processes too: an overlapping cron tick updates the same file
+    with cache.locked(_journal_path()):
+        journal = read_journal()
+        entry = journal.setdefault(name, {'stages': {}})
+        change(entry)
+        entry['updated_at'] = time.time()
+        cache.write_json_atomic(_journal_path(), journal, indent=2, sort_keys=True)
+
+
+def begin(name):
+    """Start a fresh run of dataset `name`, forgetting the previous run's stages."""
+    def change(entry):
+        entry.update(run_id=telemetry.RUN_ID, status='running', started_at=time.time(),
+                     stages={}, failed_stage=None, error=None)
+    _update(name, change)
+
+
+@contextlib.contextmanager
+def stage(name, stage_name):
+    """Journal one stage: the dict yielded is filled with a description of its output."""
+    output = {}
+    try:
+        yield output
+    except Exception as e:
+        error = str(e)
+
+        def failed(entry):
+            entry.update(status='failed', failed_stage=stage_name, error=error)
+        _update(name, failed)
+        raise
+
+    def completed(entry):
+        entry['stages'][stage_name] = {'at': time.time(), **output}
+        if entry.get('failed_stage') == stage_name:
+            entry.update(failed_stage=None, error=None)
+    _update(name, completed)
+
+
+def finish(name):
+    def change(entry):
+        entry.update(status='ok', failed_stage=None, error=None)
+    _update(name, change)
+
+
+# === One run of a dataset at a time: <STORE_DIR>/_locks/<dataset>.lock ===
+@contextlib.contextmanager
+def exclusive(name):
+    """Hold dataset `name` for this run; raises Busy if another process or thread is running it.
+
+    Re-entrant within a thread, so a run can delegate to another run of the same dataset.
+    """
+    held = _held.__dict__.setdefault('names', set())
+    if name in held:
+        yield
+        return
+    lock_file = cache.try_lock(os.path.join(config.STORE_DIR, "_locks", name))
+    if lock_file is None:
+        raise Busy(f"{name} is being run by another process")
+    held.add(name)
+    try:
+        yield
+    finally:
+        held.discard(name)
+        lock_file.close()
+
+
+def _process_alive(run_id):
+    # RUN_ID is "<start time>-<pid>"; signal 0 only checks that the process exists
+    try:
+        os.kill(int(str(run_id).rsplit('-', 1)[1]), 0)
+    except (IndexError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:  # alive, run by another user
+        pass
+    return True
+
+
+# === Resume points ===
+def unfinished(names=None):
+    """{name: entry} for datasets whose last run failed, or was interrupted (its process is gone)."""
+    return {
+        name: entry for name, entry in read_journal().items()
+        if (names is None or name in names)
+        and (entry.get('status') == 'failed'
+             or (entry.get('status') == 'running' and entry.get('run_id') != telemetry.RUN_ID
+                 and not _process_alive(entry.get('run_id'))))
+    }
+
+
+def resume_stage(entry):
+    """First stage a resumed run has to redo: the transform and store stages go together,
+    since the transformed frame only exists once it is stored."""
+    done = entry.get('stages', {})
+    if 'fetch' not in done:
+        return 'fetch'
+    if 'store' not in done:
+        return 'transform'
+    if 'upload' not in done:
+        return 'upload'
+    return None
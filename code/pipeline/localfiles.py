@@ -0,0 +1,132 @@
+import hashlib
+import os
+import re
+import warnings
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+from . import cache, config
+
+LOCAL_CACHE_DIR = os.path.join(config.CACHE_DIR, "local")
+# Bump when the parsing below changes, so cached tables are rebuilt
+PARSER_VERSION = "1"
+
+
+# === TradingView exports: time,close,EMA,EMA,EMA,Volume ===
+def _collapse_month_ends(df):
+    """Monthly exports sometimes stamp a month twice (last business day and calendar month end,
+    e.g. 1996-03-29 and 1996-03-31); keep the later row of each month."""
+    if len(df) < 2 or df['date'].diff().median() < pd.Timedelta(days=28):
+        return df
+    month = df['date'].dt.to_period('M')
+    return df[~month.duplicated(keep='last')]
+
+
+def read_tradingview_csv(path):
+    df = pd.read_csv(path)
+    ema_columns = [column for column in df.columns if column.split('.')[0] == 'EMA']
+    df = df.rename(columns={'time': 'date', 'Volume': 'volume',
+                            **{column: f"ema_{i + 1}" for i, column in enumerate(ema_columns)}})
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values('date', kind='stable').drop_duplicates('date', keep='last')
+    # The EMA studies (and Volume, for economic series) are empty when the chart had none
+    df = df.dropna(axis=1, how='all')
+    return _collapse_month_ends(df).reset_index(drop=True)
+
+
+# === RBI DBIE workbooks: a title block, one header row starting with "Date", newest rows first ===
+def _column_name(label):
+    # "M3 (1+2+3+4-5)" -> "m3": the formulas only restate the item numbering
+    label = re.sub(r'\([0-9.+\- ]+\)', '', str(label))
+    name = re.sub(r'[^0-9a-z]+', '_', label.lower()).strip('_')
+    return f"item_{name}" if name[:1].isdigit() else name
+
+
+def read_rbi_xlsx(path):
+    with warnings.catch_warnings():
+        # DBIE exports carry no default style, which openpyxl warns about on every read
+        warnings.simplefilter('ignore', UserWarning)
+        sheet = pd.read_excel(path, header=None, dtype=object)
+    sheet = sheet.dropna(axis=1, how='all')
+    header_row = sheet.index[sheet.iloc[:, 0].astype(str).str.strip() == 'Date'][0]
+    df = sheet.loc[header_row + 1:].copy()
+    df.columns = ['date'] + [_column_name(label) for label in sheet.loc[header_row].iloc[1:]]
+    # Footer lines ("See Notes on Table") have no date
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = df.dropna(subset=['date'])
+    values = df.columns[1:]
+    df[values] = df[values].apply(pd.to_numeric, errors='coerce').astype('float64')
+    df = df.dropna(axis=1, how='all')
+    df = df.sort_values('date', kind='stable').drop_duplicates('date', keep='last')
+    return df.reset_index(drop=True)
+
+
+READERS = {
+    '.csv': read_tradingview_csv,
+    '.xlsx': read_rbi_xlsx,
+}
+
+
+# === Parsed-table cache: <CACHE_DIR>/local/<file name>.arrow, tagged with the source's mtime, size and sha256 ===
+def _cache_path(file_name):
+    return os.path.join(LOCAL_CACHE_DIR, f"{file_name}.arrow")
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cached(file_name):
+    path = _cache_path(file_name)
+    if not os.path.exists(path):
+        return None, {}
+    table = feather.read_table(path, memory_map=True)
+    metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()
+                if key.startswith(b"source_") or key == b"parser_version"}
+    return table, metadata
+
+
+def _write_cached(file_name, table, source):
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **source})
+    with cache.atomic_path(_cache_path(file_name)) as tmp_path:
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+
+
+def load_file(file_name, data_dir=None):
+    """Parsed contents of data/<file_name> as a DataFrame, parsing the file only when it changed.
+
+    An unchanged mtime and size reuse the cached table without reading the source;
+    otherwise the source is hashed, and a matching sha256 (a touched or re-copied
+    file) still reuses it.
+    """
+    path = os.path.join(data_dir or config.DATA_DIR, file_name)
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"No reader for local file type {extension}: {file_name}")
+    stat = os.stat(path)
+    source = {'source_mtime_ns': str(stat.st_mtime_ns), 'source_size': str(stat.st_size), 'parser_version': PARSER_VERSION}
+
+    table, cached = _read_cached(file_name)
+    if table is not None and cached.get('parser_version') == PARSER_VERSION:
+        if all(cached.get(key) == source[key] for key in ('source_mtime_ns', 'source_size')):
+            return table.to_pandas()
+        source['source_sha256'] = _sha256(path)
+        if cached.get('source_sha256') == source['source_sha256']:
+            _write_cached(file_name, table, source)
+            return table.to_pandas()
+
+    print(f"📄 Parsing {file_name}...")
+    source.setdefault('source_sha256', _sha256(path))
+    df = READERS[extension](path)
+    _write_cached(file_name, pa.Table.from_pandas(df, preserve_index=False), source)
+    return df
+
+
+def load_files(file_names, data_dir=None):
+    return {file_name: load_file(file_name, data_dir) for file_name in file_names}
@@ -0,0 +1,115 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+from . import config, telemetry
+
+
+# === Token bucket ===
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts of up to `capacity`.
+
+    Threads wait with acquire(); coroutines on the shared event loop with acquire_async().
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _take(self):
+        """Take a token if one is available; otherwise return how long until one is."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+
+# Requests per second and burst size, at or just under each provider's published limit
+PROVIDER_LIMITS = {
+    'fred': (2.0, 4),        # 120 requests / minute
+    'coingecko': (config.COINGECKO_RATE_LIMIT, 3),  # free tier by default, ~30 requests / minute
+    'coindesk': (5.0, 5),
+    'yahoo': (1.0, 2),       # unofficial API; one batched download per second is plenty
+    'dune': (1.0, 2),
+}
+
+BUCKETS = {provider: TokenBucket(rate, capacity) for provider, (rate, capacity) in PROVIDER_LIMITS.items()}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+
+def acquire(provider):
+    BUCKETS[provider].acquire()
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, response=None):
+    """Full-jitter exponential backoff, but never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    retry_after = _retry_after(response)
+    if retry_after is not None:
+        delay = max(delay, retry_after + random.uniform(0, BACKOFF_BASE))
+    return delay
+
+
+# === Rate-limited calls with retries ===
+async def call(provider, send, max_retries=MAX_RETRIES):
+    """Await send() (which returns an aio.Response) under the provider's bucket.
+
+    429 / 5xx responses and connection errors are retried with backoff; the final
+    response is returned as-is for the caller to raise_for_status().
+    """
+    for attempt in range(max_retries + 1):
+        waited = time.perf_counter()
+        await BUCKETS[provider].acquire_async()
+        start = time.perf_counter()
+        try:
+            response = await send()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            telemetry.record_request(provider, time.perf_counter() - start, start - waited, retry=attempt > 0, error=True)
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"⚠️ {provider} request failed ({e!r}), retrying in {delay:.1f}s")
+        else:
+            telemetry.record_request(provider, time.perf_counter() - start, start - waited, retry=attempt > 0)
+            if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                return response
+            delay = backoff_delay(attempt, response)
+            print(f"⚠️ {provider} returned {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
@@ -0,0 +1,408 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Tuple, Union
+
+from . import coingecko, config, fred, transforms
+from .coindesk import TRUSTED_SOURCES
+from .indicators import EMA, RollingMean, RollingStd
+from .schema import AMOUNT, COUNT, DATE, LABEL, LEVEL, PRICE, RATIO, SYMBOL
+from .schedule import ReleaseWindow
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str            # Dune table name
+    source: str          # key into sources.FETCHERS
+    ids: Union[Tuple[str, ...], Callable]  # FRED series / tickers / coin ids passed to the fetcher, or a function resolving them at run time
+    transform: Callable  # raw fetcher output -> DataFrame
+    description: str
+    script: str = None   # standalone script in code/
+    frequency: str = None  # 'hourly' / 'daily' / 'weekly'; None for FRED means "from series metadata"
+    release_window: ReleaseWindow = None  # UTC hours when new data usually lands
+    indicators: tuple = ()  # derived columns (indicators.EMA / RollingMean / RollingStd) uploaded with the table
+    schema: dict = None  # {column: schema.Column}: in-memory dtype and CSV float format per column
+
+    def resolve_ids(self):
+        return tuple(self.ids()) if callable(self.ids) else self.ids
+
+
+# === Tracked coins ===
+COINS = {
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'ADA': 'cardano',
+    'SOL': 'solana',
+    'DOT': 'polkadot',
+    'AVAX': 'avalanche-2'
+}
+
+
+def coin_universe():
+    """{symbol: coin id} of the CoinGecko datasets: COINS, or the top COINGECKO_TOP_N coins by market cap.
+
+    Symbols are not unique across the top coins; the largest coin keeps the bare
+    symbol and smaller namesakes are written as SYMBOL:coin-id.
+    """
+    if config.COINGECKO_TOP_N <= 0:
+        return COINS
+    universe = {}
+    for row in coingecko.get_top_coins(config.COINGECKO_TOP_N):
+        symbol = row['symbol'].upper()
+        universe[symbol if symbol not in universe else f"{symbol}:{row['id']}"] = row['id']
+    return universe
+
+
+def coin_ids():
+    return tuple(coin_universe().values())
+
+# === Derived indicator columns ===
+def monthly_indicators(column):
+    return (EMA(column, 12), RollingMean(column, 12), RollingStd(column, 12))
+
+
+def daily_price_indicators(column):
+    return (EMA(column, 20), EMA(column, 50), RollingMean(column, 200), RollingStd(column, 30))
+
+
+# === Column schemas shared by several datasets ===
+TRADINGVIEW_SCHEMA = {'date': DATE, 'ema_1': LEVEL, 'ema_2': LEVEL, 'ema_3': LEVEL}
+VOLATILITY_SCHEMA = {
+    'symbol': SYMBOL, 'high_24h_usd': PRICE, 'low_24h_usd': PRICE,
+    'volatility_24h_%': RATIO, 'trading_range_24h_usd': PRICE,
+}
+COINDESK_SCHEMA = {
+    'sentiment': LABEL, 'upvotes': COUNT, 'downvotes': COUNT, 'published_on': DATE,
+    'source_type': LABEL, 'source_name': LABEL, 'benchmark_score': COUNT, 'categories': LABEL,
+}
+
+
+# === Macro panel: dataset -> {stored column: panel column} ===
+MACRO_PANEL = {
+    'us_gdp': {'us_gdp': 'us_gdp'},
+    'global_gdp': {'world_gdp_usd': 'world_gdp_usd'},
+    'us_inflation': {'cpi': 'cpi'},
+    'fed_interest_rate': {'fed_funds_rate': 'fed_funds_rate'},
+    'unemployment_data': {'Unemployment_Rate': 'unemployment_rate'},
+    'us_retail_consumption': {'Retail_Sales_Ex_Auto': 'retail_sales_ex_auto'},
+    'consumer_confidence': {'consumer_confidence': 'consumer_confidence'},
+    'housing_permits_data': {'housing_permits': 'housing_permits'},
+    'us_m2': {'us_m2': 'us_m2'},
+    'china_m2': {'close': 'china_m2'},
+    'korea_m2': {'close': 'korea_m2'},
+    'india_m3_sources': {'m3': 'india_m3'},
+    'currency_exchange': {'usd_cny': 'usd_cny', 'usd_eur': 'usd_eur', 'usd_jpy': 'usd_jpy'},
+    'dxy_daily_close_price': {'close_price_usd': 'dxy'},
+    'spy_daily_close_price': {'close_price_usd': 'spy_usd'},
+    'qqq_daily_close_price': {'close_price_usd': 'qqq_usd'},
+    'gold_daily_close_price': {'close_price_usd': 'gld_usd'},
+    'btc_daily_close_price': {'close_price_usd': 'btc_usd'},
+}
+# FRED columns of the panel: joined on when each observation was first published, not its period
+MACRO_PANEL_RELEASES = {
+    'us_gdp': 'GDP',
+    'world_gdp_usd': 'NYGDPMKTPCDWLD',
+    'cpi': 'CPIAUCSL',
+    'fed_funds_rate': 'FEDFUNDS',
+    'unemployment_rate': 'UNRATE',
+    'retail_sales_ex_auto': 'RSXFS',
+    'consumer_confidence': 'UMCSENT',
+    'housing_permits': 'PERMIT',
+    'us_m2': 'M2SL',
+    'usd_cny': 'DEXCHUS',
+    'usd_eur': 'DEXUSEU',
+    'usd_jpy': 'DEXJPUS',
+}
+# Columns from the data/ files, which carry no release dates: days from an observation's
+# date to its usual publication (PBoC by mid-month, the BoK's M2 about seven weeks after
+# month end, RBI's fortnightly M3 in the supplement about two weeks later)
+MACRO_PANEL_LAGS = {
+    'china_m2': 15,
+    'korea_m2': 50,
+    'india_m3': 14,
+}
+
+
+# === Release windows (UTC) ===
+US_MARKET_CLOSE = ReleaseWindow(21, 24, weekdays=(0, 1, 2, 3, 4))
+CRYPTO_DAY_ROLLOVER = ReleaseWindow(0, 2)
+
+
+# === Dataset registry ===
+DATASETS = [
+    # --- FRED ---
+    Dataset(
+        name="consumer_confidence",
+        source="fred",
+        ids=("UMCSENT",),
+        transform=transforms.fred_series('consumer_confidence'),
+        schema={'date': DATE},
+        description="University of Michigan Consumer Sentiment Index (UMCSENT) from FRED",
+        script="ConsumerConfidence.py",
+    ),
+    Dataset(
+        name="currency_exchange",
+        source="fred",
+        ids=("DEXCHUS", "DEXUSEU", "DEXJPUS"),
+        transform=transforms.fred_frame({'DEXCHUS': 'usd_cny', 'DEXUSEU': 'usd_eur', 'DEXJPUS': 'usd_jpy'}),
+        # Kept float64 as FRED publishes them: a float32 rate widened in the macro panel reads 343.5100098
+        schema={'date': DATE},
+        description="Exchange rates: USD to CNY, EUR, and JPY from FRED (DEXCHUS, DEXUSEU, DEXJPUS)",
+        script="CurrencyExchange.py",
+    ),
+    Dataset(
+        name="us_gdp",
+        source="fred",
+        ids=("GDP",),
+        transform=transforms.fred_series('us_gdp'),
+        schema={'date': DATE},
+        description="Quarterly US Gross Domestic Product (GDP) from FRED (GDP)",
+        script="GDPData.py",
+    ),
+    Dataset(
+        name="global_gdp",
+        source="fred",
+        ids=("NYGDPMKTPCDWLD",),
+        transform=transforms.fred_series('world_gdp_usd'),
+        schema={'date': DATE},
+        description="World GDP (current US$) from FRED (NYGDPMKTPCDWLD)",
+        script="GlobalGDP.py",
+    ),
+    Dataset(
+        name="housing_permits_data",
+        source="fred",
+        ids=("PERMIT",),
+        transform=transforms.fred_series('housing_permits'),
+        schema={'date': DATE},
+        description="US Housing Permits data from FRED",
+        script="HousingPermit.py",
+    ),
+    Dataset(
+        name="us_inflation",
+        source="fred",
+        ids=("CPIAUCSL",),
+        transform=transforms.fred_series('cpi'),
+        schema={'date': DATE},
+        description="US Inflation data (CPIAUCSL) from FRED",
+        script="InflationData.py",
+    ),
+    Dataset(
+        name="fed_interest_rate",
+        source="fred",
+        ids=("FEDFUNDS",),
+        transform=transforms.fred_series('fed_funds_rate'),
+        schema={'date': DATE},
+        description="Fed Interest Rate data (FEDFUNDS) from FRED",
+        script="InterestRate.py",
+    ),
+    Dataset(
+        name="us_m2",
+        source="fred",
+        ids=("M2SL",),
+        transform=transforms.fred_series('us_m2'),
+        schema={'date': DATE},
+        description="Weekly US M2 Money Supply from FRED (M2SL)",
+        script="M2Data.py",
+        indicators=monthly_indicators('us_m2'),
+    ),
+    Dataset(
+        name="unemployment_data",
+        source="fred",
+        ids=("UNRATE",),
+        transform=transforms.fred_series('Unemployment_Rate', date_column='Date'),
+        schema={'Date': DATE},
+        description="US Unemployment Rate data from FRED.",
+        script="UnemploymentData.py",
+    ),
+    Dataset(
+        name="us_retail_consumption",
+        source="fred",
+        ids=("RSXFS",),
+        transform=transforms.fred_series('Retail_Sales_Ex_Auto', date_column='DATE'),
+        schema={'DATE': DATE},
+        description="Retail sales ex-auto (RSXFS) from FRED",
+        script="retailConsumption.py",
+    ),
+
+    # --- Yahoo Finance ---
+    Dataset(
+        name="btc_daily_close_price",
+        source="yfinance",
+        ids=("BTC-USD",),
+        transform=transforms.yfinance_close,
+        schema={'date': DATE, 'close_price_usd': LEVEL},
+        description="Daily BTC closing price from Yahoo Finance (Max Duration)",
+        script="BTCPriceDaily.py",
+        frequency="daily",
+        release_window=CRYPTO_DAY_ROLLOVER,
+        indicators=daily_price_indicators('close_price_usd'),
+    ),
+    Dataset(
+        name="gold_daily_close_price",
+        source="yfinance",
+        ids=("GLD",),
+        transform=transforms.yfinance_close,
+        schema={'date': DATE, 'close_price_usd': LEVEL},
+        description="Full historical GLD daily close price from Yahoo Finance",
+        script="GoldDailyPrice.py",
+        frequency="daily",
+        release_window=US_MARKET_CLOSE,
+    ),
+    Dataset(
+        name="qqq_daily_close_price",
+        source="yfinance",
+        ids=("QQQ",),
+        transform=transforms.yfinance_close,
+        schema={'date': DATE, 'close_price_usd': LEVEL},
+        description="Full historical QQQ daily close price from Yahoo Finance",
+        script="QQQData.py",
+        frequency="daily",
+        release_window=US_MARKET_CLOSE,
+    ),
+    Dataset(
+        name="spy_daily_close_price",
+        source="yfinance",
+        ids=("SPY",),
+        transform=transforms.yfinance_close,
+        schema={'date': DATE, 'close_price_usd': LEVEL},
+        description="Full historical SPY daily close price from Yahoo Finance",
+        script="SPYData.py",
+        frequency="daily",
+        release_window=US_MARKET_CLOSE,
+    ),
+    Dataset(
+        name="dxy_daily_close_price",
+        source="yfinance",
+        ids=("DX-Y.NYB",),
+        transform=transforms.yfinance_close,
+        schema={'date': DATE, 'close_price_usd': LEVEL},
+        description="Full historical DXY daily close price from Yahoo Finance",
+        script="USDollarIndex.py",
+        frequency="daily",
+        release_window=US_MARKET_CLOSE,
+    ),
+
+    # --- Local files (data/) ---
+    Dataset(
+        name="china_m2",
+        source="local",
+        ids=("ECONOMICS_CNM2, 1D.csv",),
+        transform=transforms.local_file,
+        schema=TRADINGVIEW_SCHEMA,
+        description="Monthly China M2 money supply with TradingView EMAs (data/ECONOMICS_CNM2, 1D.csv)",
+        script="ChinaM2.py",
+        frequency="daily",
+        indicators=monthly_indicators('close'),
+    ),
+    Dataset(
+        name="korea_m2",
+        source="local",
+        ids=("ECONOMICS_KRM2, 1D.csv",),
+        transform=transforms.local_file,
+        schema=TRADINGVIEW_SCHEMA,
+        description="Monthly South Korea M2 money supply with TradingView EMAs (data/ECONOMICS_KRM2, 1D.csv)",
+        script="KoreaM2.py",
+        frequency="daily",
+        indicators=monthly_indicators('close'),
+    ),
+    Dataset(
+        name="india_m3_sources",
+        source="local",
+        ids=("RBIB Table No. 07 _ Sources of Money Stock (M3).xlsx",),
+        transform=transforms.local_file,
+        schema={'date': DATE},
+        description="Fortnightly sources of India's M3 money stock, Rs crore (RBI Handbook Table 07)",
+        script="IndiaM3.py",
+        frequency="daily",
+    ),
+
+    # --- Panels built from the stored tables above ---
+    Dataset(
+        name="macro_panel",
+        source="stored",
+        ids=tuple(MACRO_PANEL),
+        transform=transforms.as_of_panel(MACRO_PANEL, release_dates={
+            column: partial(fred.release_dates, series_id) for column, series_id in MACRO_PANEL_RELEASES.items()
+        }, publication_lags=MACRO_PANEL_LAGS),
+        schema={'date': DATE, **{column: LEVEL for columns in MACRO_PANEL.values() for column in columns.values()}},
+        description="Daily panel of the macro and market series, each carrying its last published value (as-of join)",
+        script="MacroPanel.py",
+        frequency="daily",
+    ),
+
+    # --- CoinGecko ---
+    Dataset(
+        name="crypto_365d_volatility_range",
+        source="coingecko_chart",
+        ids=coin_ids,
+        transform=transforms.volatility_range(coin_universe),
+        schema=VOLATILITY_SCHEMA,
+        description="365-day volatility and trading range for major crypto assets from CoinGecko",
+        script="24h Volatility & Trading Range.py",
+        frequency="daily",
+        release_window=CRYPTO_DAY_ROLLOVER,
+    ),
+    Dataset(
+        name="volatility_trading_range_data",
+        source="coingecko_chart",
+        ids=coin_ids,
+        transform=transforms.volatility_range(coin_universe),
+        schema=VOLATILITY_SCHEMA,
+        description="365-Day Volatility and Trading Range data for various cryptocurrencies.",
+        script="PricesScript.py",
+        frequency="daily",
+        release_window=CRYPTO_DAY_ROLLOVER,
+    ),
+    Dataset(
+        name="crypto_volume_traded",
+        source="coingecko_chart",
+        ids=coin_ids,
+        transform=transforms.volume_traded(coin_universe),
+        schema={'symbol': SYMBOL, 'date': DATE, 'volume_usd': AMOUNT},
+        description="Crypto Volume Traded Data from CoinGecko.",
+        script="VolumeTraded.py",
+        frequency="daily",
+        release_window=CRYPTO_DAY_ROLLOVER,
+    ),
+    Dataset(
+        name="market_cap_data",
+        source="coingecko_market_cap",
+        ids=coin_ids,
+        transform=transforms.market_cap(coin_universe),
+        schema={'price': PRICE, 'date': DATE, 'volume': AMOUNT, 'market_cap': AMOUNT, 'symbol': SYMBOL},
+        description="Historical Market Cap data for various cryptocurrencies.",
+        script="MarketCap.py",
+        frequency="daily",
+        release_window=CRYPTO_DAY_ROLLOVER,
+    ),
+    Dataset(
+        name="trending_coins",
+        source="coingecko_trending",
+        ids=(),
+        transform=transforms.trending_coins,
+        schema={'market_cap_rank': COUNT, 'score': COUNT},
+        description="Trending coins from CoinGecko API (get_search_trending)",
+        script="GoogleTrending.py",
+        frequency="hourly",
+    ),
+
+    # --- CoinDesk ---
+    Dataset(
+        name="coindesk_sentiment",
+        source="coindesk",
+        ids=tuple(TRUSTED_SOURCES),
+        transform=transforms.coindesk_articles,
+        schema=COINDESK_SCHEMA,
+        description="Latest crypto sentiment articles from trusted sources via CoinDesk API",
+        script="CoinDeskSentiment.py",
+        frequency="hourly",
+    ),
+]
+
+DATASETS_BY_NAME = {dataset.name: dataset for dataset in DATASETS}
+
+
+def get_dataset(name):
+    try:
+        return DATASETS_BY_NAME[name]
+    except KeyError:
+        raise KeyError(f"Unknown dataset: {name}") from None
@@ -0,0 +1,116 @@
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from . import cache, config, fred
+
+# Cron ticks fire on the hour but a run takes a few minutes; don't let that push a dataset to the next tick
+SLACK = timedelta(minutes=10)
+
+# How often a FRED series' metadata is checked for a new release, by FRED frequency code
+FRED_POLL_INTERVALS = {
+    'D': timedelta(hours=1),
+    'W': timedelta(hours=3),
+    'BW': timedelta(hours=3),
+    'M': timedelta(hours=6),
+    'Q': timedelta(hours=12),
+    'SA': timedelta(hours=24),
+    'A': timedelta(hours=24),
+}
+
+# Longest a configured dataset can go without a refresh, by cadence
+MAX_AGE = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7),
+}
+
+
+@dataclass(frozen=True)
+class ReleaseWindow:
+    """UTC hours [start_hour, end_hour) on the given weekdays (Mon=0) when new data usually lands."""
+    start_hour: int
+    end_hour: int
+    weekdays: tuple = (0, 1, 2, 3, 4, 5, 6)
+
+    def start_on(self, day):
+        return datetime(day.year, day.month, day.day, self.start_hour, tzinfo=timezone.utc)
+
+    def contains(self, now):
+        return now.weekday() in self.weekdays and self.start_hour <= now.hour < self.end_hour
+
+
+# === Last successful run per dataset ===
+def _runs_path():
+    return os.path.join(config.STORE_DIR, "_runs.json")
+
+
+def read_runs():
+    if not os.path.exists(_runs_path()):
+        return {}
+    with open(_runs_path()) as f:
+        return json.load(f)
+
+
+def record_runs(names, when=None):
+    when = (when or datetime.now(timezone.utc)).timestamp()
+    with cache.locked(_runs_path()):
+        runs = read_runs()
+        for name in names:
+            runs[name] = when
+        cache.write_json_atomic(_runs_path(), runs, indent=2, sort_keys=True)
+
+
+# === Due checks ===
+def _fred_due(dataset, last_run, now):
+    for series_id in dataset.ids:
+        try:
+            # The frequency never changes, so any cached copy will do to pick the poll interval
+            frequency = fred.get_series_info(series_id, max_age=float('inf'))['frequency_short']
+            if now - last_run < FRED_POLL_INTERVALS.get(frequency, timedelta(hours=1)) - SLACK:
+                continue
+            info = fred.get_series_info(series_id)
+        except Exception as e:
+            return f"FRED metadata for {series_id} unavailable ({e})"
+        last_updated = pd.Timestamp(info['last_updated']).tz_convert('UTC')
+        if last_updated > last_run:
+            return f"{series_id} updated {last_updated:%Y-%m-%d %H:%M} UTC"
+    return None
+
+
+def _configured_due(dataset, last_run, now):
+    age = now - last_run
+    if age >= MAX_AGE[dataset.frequency] - SLACK:
+        return f"{dataset.frequency} refresh ({age.total_seconds() / 3600:.1f}h old)"
+
+    window = dataset.release_window
+    if window is not None and window.contains(now) and last_run < window.start_on(now) - SLACK:
+        return f"release window {window.start_hour:02d}-{window.end_hour:02d} UTC"
+    return None
+
+
+def due_reason(dataset, now=None, runs=None):
+    """Why dataset should run on this tick, or None if it is not due."""
+    now = now or datetime.now(timezone.utc)
+    runs = read_runs() if runs is None else runs
+    if dataset.name not in runs:
+        return "never run"
+    last_run = datetime.fromtimestamp(runs[dataset.name], timezone.utc)
+
+    if dataset.frequency is None and dataset.source == 'fred':
+        return _fred_due(dataset, last_run, now)
+    return _configured_due(dataset, last_run, now)
+
+
+def due_datasets(datasets, now=None):
+    """{name: reason} for the datasets that are due on this tick."""
+    runs = read_runs()
+    due = {}
+    for dataset in datasets:
+        reason = due_reason(dataset, now=now, runs=runs)
+        if reason is not None:
+            due[dataset.name] = reason
+    return due
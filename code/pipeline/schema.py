@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+@dataclass(frozen=True)
+class Column:
+    """How one table column is held in memory and the store, and written to the upload CSV."""
+    dtype: str = None   # pandas dtype ('float32', 'category', 'Int32', ...) or 'date' for a day without a time
+    float_format: str = None  # printf format of the CSV text, e.g. '%.10g' (None: shortest exact repr)
+
+
+# === Shared column types ===
+DATE = Column('date')
+SYMBOL = Column('category')
+LABEL = Column('category')
+COUNT = Column('Int32')
+# Prices and percentages only carry ~7 significant digits; a float32 holds them and writes them short
+PRICE = Column('float32')
+RATIO = Column('float32')
+# Dollar totals (volumes, market caps) run to 10^13: a float64, written in whole dollars
+AMOUNT = Column(float_format='%.0f')
+# Series that picked up float noise in their last digits (Yahoo closes, TradingView EMAs)
+LEVEL = Column(float_format='%.10g')
+
+
+DATE_DTYPE = pd.ArrowDtype(pa.date32())
+
+
+def _cast(values, dtype):
+    if dtype == 'date':
+        return pd.to_datetime(values).astype(DATE_DTYPE)
+    return values.astype(dtype)
+
+
+def apply(df, schema):
+    """Cast df's columns to the dtypes in schema ({column: Column}); columns it doesn't list are left alone."""
+    if not schema:
+        return df
+    casts = {
+        column: spec.dtype for column, spec in schema.items()
+        if spec.dtype is not None and column in df.columns
+        and not (df[column].dtype == DATE_DTYPE if spec.dtype == 'date' else df[column].dtype == spec.dtype)
+    }
+    if not casts:
+        return df
+    return df.assign(**{column: _cast(df[column], dtype) for column, dtype in casts.items()})
+
+
+def float_formats(schema, indicators=()):
+    """{column: printf format} for the upload CSV; indicator columns follow their input column."""
+    formats = {column: spec.float_format for column, spec in (schema or {}).items() if spec.float_format is not None}
+    for indicator in indicators:
+        if indicator.column in formats:
+            formats.setdefault(indicator.name, formats[indicator.column])
+    return formats
+
+
+def format_floats(values, float_format):
+    """Float column as CSV text; missing values are left empty."""
+    values = np.asarray(values, dtype=float)
+    text = np.char.mod(float_format, values).astype(object)
+    text[np.isnan(values)] = ""
+    return text
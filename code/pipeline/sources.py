@@ -0,0 +1,101 @@
+from . import coindesk, coingecko, config, fred, localfiles, store, yahoo
+
+
+# === FRED ===
+def fetch_fred(series_ids):
+    series = fred.get_series_many(series_ids)
+    missing = [series_id for series_id in series_ids if series_id not in series]
+    if missing:
+        raise RuntimeError(f"FRED fetch failed for: {', '.join(missing)}")
+    return series
+
+
+# === Yahoo Finance ===
+def fetch_yfinance(tickers):
+    closes = yahoo.get_closes(tickers)
+    missing = [ticker for ticker in tickers if ticker not in closes]
+    if missing:
+        raise RuntimeError(f"Yahoo download failed for: {', '.join(missing)}")
+    return closes
+
+
+# === CoinGecko ===
+def _check_coins(coin_ids, found, what):
+    """Any missing tracked coin fails the dataset; a top-N universe tolerates a few (delistings, outages)."""
+    missing = [coin_id for coin_id in coin_ids if coin_id not in found]
+    if not missing:
+        return
+    if config.COINGECKO_TOP_N > 0 and len(missing) <= len(coin_ids) // 10:
+        print(f"⚠️ Skipping {len(missing)} coins without {what}: {', '.join(missing)}")
+        return
+    raise RuntimeError(f"CoinGecko {what} failed for: {', '.join(missing)}")
+
+
+def fetch_coingecko_chart(coin_ids):
+    charts = coingecko.get_market_charts(coin_ids)
+    _check_coins(coin_ids, charts, "market chart")
+    return charts
+
+
+def with_circulating_supply(coin_ids, charts):
+    markets = coingecko.get_coin_markets(coin_ids)
+    # Some coins come back with a null (or zero) supply; they have no market cap, so count them as missing
+    markets = {coin_id: row for coin_id, row in markets.items() if row.get('circulating_supply')}
+    _check_coins(coin_ids, markets, "markets lookup")
+    return {
+        coin_id: {
+            'chart': charts[coin_id],
+            'circulating_supply': markets[coin_id]['circulating_supply']
+        }
+        for coin_id in coin_ids if coin_id in charts and coin_id in markets
+    }
+
+
+def fetch_coingecko_market_cap(coin_ids):
+    return with_circulating_supply(coin_ids, fetch_coingecko_chart(coin_ids))
+
+
+def fetch_coingecko_trending(_ids=()):
+    print("🔍 Fetching trending coins from CoinGecko...")
+    return coingecko.get_search_trending()
+
+
+# === CoinDesk ===
+def fetch_coindesk_articles(source_ids=coindesk.TRUSTED_SOURCES):
+    return coindesk.get_articles(source_ids)
+
+
+# === Local files (data/) ===
+def fetch_local(file_names):
+    return localfiles.load_files(file_names)
+
+
+# === Stored tables (panels built from other datasets) ===
+def fetch_stored(names):
+    tables = {name: store.read_table(name) for name in names}
+    missing = [name for name, table in tables.items() if table is None]
+    if len(missing) == len(names):
+        raise RuntimeError(f"Nothing stored for: {', '.join(missing)}; run those datasets first")
+    if missing:
+        print(f"⚠️ Not stored yet, left empty in the panel: {', '.join(missing)}")
+    return {name: table for name, table in tables.items() if table is not None}
+
+
+FETCHERS = {
+    'fred': fetch_fred,
+    'yfinance': fetch_yfinance,
+    'coingecko_chart': fetch_coingecko_chart,
+    'coingecko_market_cap': fetch_coingecko_market_cap,
+    'coingecko_trending': fetch_coingecko_trending,
+    'coindesk': fetch_coindesk_articles,
+    'local': fetch_local,
+    'stored': fetch_stored,
+}
+
+# Sources whose datasets are fetched together in one batch per run.
+# Each takes the union of ids and returns {id: data}, leaving out ids that failed.
+BATCH_FETCHERS = {
+    'fred': fred.get_series_many,
+    'yfinance': yahoo.get_closes,
+    'coingecko_chart': coingecko.get_market_charts,
+}
@@ -0,0 +1,151 @@
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import pyarrow as pa
+
+from . import cache, config
+
+# Appends beyond this many part files trigger a rewrite into a single part
+MAX_PARTS = 32
+
+
+# === Layout: <STORE_DIR>/<table>/part-NNNNN.arrow, listed in manifest.json (+ raw.pkl, the last fetch output) ===
+# A table is exactly the parts its manifest lists. Writers add part files first and then publish
+# a new manifest with one os.replace, so readers see the old table or the new one, never a mix;
+# parts no manifest lists any more are removed afterwards.
+def _table_dir(name):
+    return os.path.join(config.STORE_DIR, name)
+
+
+def _manifest_path(name):
+    return os.path.join(_table_dir(name), "manifest.json")
+
+
+def _part_files(name):
+    """Every part file on disk, listed or not."""
+    return sorted(glob.glob(os.path.join(_table_dir(name), "part-*.arrow")))
+
+
+def _parts(name):
+    """Paths of the parts making up the table, in order."""
+    path = _manifest_path(name)
+    if not os.path.exists(path):
+        # Stores written before manifests: every part file belongs to the table
+        return _part_files(name)
+    with open(path) as f:
+        return [os.path.join(_table_dir(name), part) for part in json.load(f)['parts']]
+
+
+def _publish(name, parts):
+    cache.write_json_atomic(_manifest_path(name), {'parts': [os.path.basename(path) for path in parts]})
+    for path in set(_part_files(name)) - set(parts):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+def _next_number(name):
+    # Numbered after every file on disk, so a part left over by a crashed write is never reused
+    files = _part_files(name)
+    return int(os.path.basename(files[-1])[5:10]) + 1 if files else 0
+
+
+def _write_part(name, table, number):
+    path = os.path.join(_table_dir(name), f"part-{number:05d}.arrow")
+    # Uncompressed Arrow IPC files can be memory-mapped and read without copying
+    with cache.atomic_path(path) as tmp_path:
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+# === Tables ===
+def read_arrow(name):
+    for attempt in range(3):
+        parts = _parts(name)
+        if not parts:
+            return None
+        try:
+            tables = [pa.ipc.open_file(pa.memory_map(path)).read_all() for path in parts]
+        except FileNotFoundError:
+            # A rewrite published a new manifest and removed these parts meanwhile; read that one
+            if attempt == 2:
+                raise
+            continue
+        return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+
+def read_table(name):
+    """The stored table as a DataFrame, or None if the table has never been written."""
+    table = read_arrow(name)
+    return None if table is None else table.to_pandas()
+
+
+def write_table(name, df):
+    """Store df as the current contents of table `name`.
+
+    When the stored rows are an unchanged prefix of df only the new tail is
+    appended as another part; otherwise the table is rewritten. Returns
+    (mode, rows_written) with mode in 'unchanged', 'append' or 'rewrite'.
+    """
+    new = pa.Table.from_pandas(df, preserve_index=False)
+    stored = read_arrow(name)
+    parts = _parts(name)
+
+    if stored is not None and new.schema.equals(stored.schema) and new.num_rows >= stored.num_rows \
+            and new.slice(0, stored.num_rows).equals(stored):
+        tail = new.slice(stored.num_rows)
+        if tail.num_rows == 0:
+            return 'unchanged', 0
+        if len(parts) < MAX_PARTS:
+            _publish(name, parts + [_write_part(name, tail, _next_number(name))])
+            return 'append', tail.num_rows
+
+    # Rewrite into one part numbered after the existing ones; publishing it drops the old parts
+    _publish(name, [_write_part(name, new, _next_number(name))])
+    return 'rewrite', new.num_rows
+
+
+# === Last successful upload per table (content hash) ===
+def _uploads_path():
+    return os.path.join(config.STORE_DIR, "_uploads.json")
+
+
+def read_uploads():
+    path = _uploads_path()
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def last_upload(name):
+    return read_uploads().get(name)
+
+
+def record_upload(name, digest, csv_bytes):
+    with cache.locked(_uploads_path()):
+        uploads = read_uploads()
+        uploads[name] = {'sha256': digest, 'csv_bytes': csv_bytes, 'uploaded_at': time.time()}
+        cache.write_json_atomic(_uploads_path(), uploads, indent=2, sort_keys=True)
+
+
+# === Raw fetch output ===
+def write_raw(name, raw):
+    """Store the fetch output; returns the sha256 of what was written."""
+    data = pickle.dumps(raw, protocol=pickle.HIGHEST_PROTOCOL)
+    with cache.atomic_path(os.path.join(_table_dir(name), "raw.pkl")) as tmp_path, open(tmp_path, "wb") as f:
+        f.write(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_raw(name):
+    path = os.path.join(_table_dir(name), "raw.pkl")
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -0,0 +1,184 @@
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+from . import cache, config
+
+# One id per process, shared by every span it emits
+RUN_ID = f"{int(time.time())}-{os.getpid()}"
+
+_current = contextvars.ContextVar('span', default=None)
+_write_lock = threading.Lock()
+# Finished spans per dataset, waiting for that dataset's Prometheus textfile
+_finished = {}
+# Every span this process emitted, for its run report
+_run_spans = []
+_rotated = False
+
+
+class Span:
+    """One timed stage of a dataset run, plus the provider requests made inside it."""
+
+    def __init__(self, dataset, stage):
+        self.dataset = dataset
+        self.stage = stage
+        self.fields = {}
+        self.http = {}
+        self.status = 'ok'
+        self.error = None
+        self.started = time.time()
+        self.seconds = None
+        self.lock = threading.Lock()
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def record_request(self, provider, seconds, wait_seconds=0.0, retry=False, error=False):
+        with self.lock:
+            stats = self.http.setdefault(provider, {
+                'requests': 0, 'retries': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'wait_seconds': 0.0,
+            })
+            stats['requests'] += 1
+            stats['retries'] += retry
+            stats['errors'] += error
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['wait_seconds'] += wait_seconds
+
+    def to_dict(self):
+        return {
+            'run_id': RUN_ID,
+            'dataset': self.dataset,
+            'stage': self.stage,
+            'started': round(self.started, 3),
+            'seconds': round(self.seconds, 6),
+            'status': self.status,
+            'error': self.error,
+            **self.fields,
+            'http': {provider: {key: round(value, 6) for key, value in stats.items()} for provider, stats in self.http.items()},
+        }
+
+
+@contextlib.contextmanager
+def span(stage, dataset=None, **fields):
+    """Time the block as `stage`; the dataset defaults to the enclosing span's."""
+    parent = _current.get()
+    current = Span(dataset or (parent.dataset if parent else None), stage)
+    current.set(**fields)
+    token = _current.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.status, current.error = 'failed', str(e)
+        raise
+    finally:
+        current.seconds = time.perf_counter() - start
+        _current.reset(token)
+        _emit(current)
+
+
+def record_request(provider, seconds, wait_seconds=0.0, retry=False, error=False):
+    """Attribute one provider request to the innermost open span (no-op outside spans)."""
+    current = _current.get()
+    if current is not None:
+        current.record_request(provider, seconds, wait_seconds, retry, error)
+
+
+# === Output: <METRICS_DIR>/spans.jsonl and one Prometheus textfile per dataset ===
+def _spans_path():
+    return os.path.join(config.METRICS_DIR, "spans.jsonl")
+
+
+def _rotate():
+    """Once per process: past METRICS_MAX_BYTES, spans.jsonl moves to spans.jsonl.1 (replacing the older one)."""
+    global _rotated
+    _rotated = True
+    path = _spans_path()
+    if os.path.exists(path) and os.path.getsize(path) > config.METRICS_MAX_BYTES:
+        os.replace(path, f"{path}.1")
+
+
+def _emit(finished):
+    record = finished.to_dict()
+    line = json.dumps(record, sort_keys=True)
+    with _write_lock:
+        os.makedirs(config.METRICS_DIR, exist_ok=True)
+        if not _rotated:
+            _rotate()
+        with open(_spans_path(), "a") as f:
+            f.write(line + "\n")
+        _finished.setdefault(finished.dataset, []).append(finished)
+        _run_spans.append(record)
+
+
+def _labels(dataset, finished, **extra):
+    labels = {'dataset': dataset, 'stage': finished.stage, **extra}
+    if 'source' in finished.fields:
+        labels['source'] = finished.fields['source']
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def _prometheus_lines(dataset, spans):
+    lines = [
+        "# HELP pipeline_stage_seconds Duration of the last run's stage.",
+        "# TYPE pipeline_stage_seconds gauge",
+    ]
+    lines += [f"pipeline_stage_seconds{{{_labels(dataset, s)}}} {s.seconds:.6f}" for s in spans]
+    for field, help_text in (('rows', "Rows handled by the stage."), ('bytes', "Payload bytes produced or sent by the stage.")):
+        lines += [f"# HELP pipeline_stage_{field} {help_text}", f"# TYPE pipeline_stage_{field} gauge"]
+        lines += [
+            f"pipeline_stage_{field}{{{_labels(dataset, s)}}} {s.fields[field]}"
+            for s in spans if s.fields.get(field) is not None
+        ]
+    lines += ["# HELP pipeline_stage_success 1 if the stage succeeded.", "# TYPE pipeline_stage_success gauge"]
+    lines += [f"pipeline_stage_success{{{_labels(dataset, s)}}} {int(s.status == 'ok')}" for s in spans]
+
+    for metric, key, help_text in (
+        ('pipeline_http_requests', 'requests', "Provider requests made by the stage, retries included."),
+        ('pipeline_http_retries', 'retries', "Provider requests that were retries."),
+        ('pipeline_http_errors', 'errors', "Provider requests that failed without a response."),
+        ('pipeline_http_request_seconds', 'seconds', "Total provider request latency."),
+        ('pipeline_http_request_max_seconds', 'max_seconds', "Slowest provider request."),
+        ('pipeline_http_rate_limit_wait_seconds', 'wait_seconds', "Time spent waiting on the provider's rate limit."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [
+            f"{metric}{{{_labels(dataset, s, provider=provider)}}} {stats[key]:g}"
+            for s in spans for provider, stats in s.http.items()
+        ]
+
+    lines += [
+        "# HELP pipeline_last_run_timestamp_seconds When the dataset last finished a run.",
+        "# TYPE pipeline_last_run_timestamp_seconds gauge",
+        f'pipeline_last_run_timestamp_seconds{{dataset="{dataset}"}} {time.time():.0f}',
+    ]
+    return lines
+
+
+def write_prometheus(dataset):
+    """Write the spans finished for dataset to <METRICS_DIR>/<dataset>.prom (node_exporter textfile format)."""
+    with _write_lock:
+        spans = _finished.pop(dataset, [])
+    if not spans:
+        return None
+    name = dataset or "_pipeline"
+    path = os.path.join(config.METRICS_DIR, f"{name}.prom")
+    with cache.atomic_path(path) as tmp_path, open(tmp_path, "w") as f:
+        f.write("\n".join(_prometheus_lines(name, spans)) + "\n")
+    return path
+
+
+def read_spans(run_id=RUN_ID):
+    """Spans emitted by run_id (this process by default, kept in memory), oldest first."""
+    if run_id == RUN_ID:
+        with _write_lock:
+            return list(_run_spans)
+    path = _spans_path()
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [span for span in map(json.loads, f) if span['run_id'] == run_id]
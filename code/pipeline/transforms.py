@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+
+from . import coindesk
+
+
+# === FRED ===
+def fred_series(column, date_column='date'):
+    """Build a transform turning a single FRED series into a two-column frame."""
+    def transform(raw):
+        (data,) = raw.values()
+        return pd.DataFrame({
+            date_column: data.index.strftime('%Y-%m-%d'),
+            column: data.values
+        })
+    return transform
+
+
+def fred_frame(columns, date_column='date'):
+    """Build a transform aligning several FRED series on the first series' dates."""
+    def transform(raw):
+        series = [raw[series_id] for series_id in columns]
+        index = series[0].index
+        df = pd.DataFrame({date_column: index.strftime('%Y-%m-%d')})
+        for series_id, data in zip(columns, series):
+            df[columns[series_id]] = data.reindex(index).values
+        return df
+    return transform
+
+
+# === Yahoo Finance ===
+def yfinance_close(raw):
+    (data,) = raw.values()
+    return pd.DataFrame({
+        'date': data.index.strftime('%Y-%m-%d'),
+        'close_price_usd': data.values
+    })
+
+
+# === Local files (data/) ===
+def local_file(raw):
+    (data,) = raw.values()
+    return data.assign(date=data['date'].dt.strftime('%Y-%m-%d'))
+
+
+# === Panels over stored tables ===
+def _date_column(table):
+    return next(column for column in table.columns if column.lower() == 'date')
+
+
+def _as_of_series(dates, values, known_on):
+    """(day each value became known, value) in order of the day, the latest observation known
+    by each day winning (an older period published later never replaces a newer one)."""
+    order = np.lexsort((dates, known_on))
+    dates, values, known_on = dates[order], values[order], known_on[order]
+    if not len(dates):
+        return known_on, values
+    # Position of the newest period known so far
+    latest = np.maximum.accumulate(np.where(dates == np.maximum.accumulate(dates), np.arange(len(dates)), 0))
+    return known_on, values[latest]
+
+
+def _as_float64(column):
+    """Column as float64; float32 values go through their shortest text so 343.51 does not become 343.5100098."""
+    values = column.to_numpy()
+    if values.dtype == np.float32:
+        return values.astype(str).astype(float)
+    return column.to_numpy(dtype=float)
+
+
+def as_of_panel(columns, release_dates=None, publication_lags=None, date_column='date'):
+    """Build a transform aligning stored tables onto one daily calendar.
+
+    `columns` maps dataset -> {stored column: panel column}. Every panel column
+    carries the last value known on each day (an as-of join), so monthly,
+    quarterly and business-day series line up row by row. Observations are
+    known from their own date, unless `release_dates` maps the panel column to
+    a function returning the date each observation was first published (FRED
+    dates are the start of the period, weeks or months before the release), or
+    `publication_lags` maps it to the days from an observation's date to its
+    publication (for sources without release dates, like the data/ files).
+    """
+    release_dates = release_dates or {}
+    publication_lags = publication_lags or {}
+
+    def transform(raw):
+        series = {}
+        for name, mapping in columns.items():
+            table = raw.get(name)
+            dates = pd.to_datetime(table[_date_column(table)]).to_numpy(dtype='datetime64[D]') if table is not None else None
+            for column, panel_column in mapping.items():
+                if table is None:
+                    series[panel_column] = (np.array([], dtype='datetime64[D]'), np.array([]))
+                    continue
+                values = _as_float64(table[column])
+                known_on = dates + np.timedelta64(publication_lags.get(panel_column, 0), 'D')
+                released = release_dates[panel_column]() if panel_column in release_dates else None
+                if released is not None:
+                    known_on = released.reindex(pd.DatetimeIndex(dates)).to_numpy(dtype='datetime64[D]')
+                    # Observations without a release date (e.g. fetched after tracking was switched off)
+                    # keep their own date rather than dropping out of the panel
+                    undated = np.isnat(known_on) & ~np.isnan(values)
+                    if undated.any():
+                        print(f"⚠️ {undated.sum()} {panel_column} observations have no release date; "
+                              f"they are joined on observation dates (look-ahead)")
+                        known_on = np.where(np.isnat(known_on), dates, known_on)
+                elif panel_column in release_dates:
+                    print(f"⚠️ No release dates for {panel_column}; it is joined on observation dates (look-ahead)")
+                known = ~np.isnan(values)
+                series[panel_column] = _as_of_series(dates[known], values[known], known_on[known])
+
+        observed = [dates for dates, _ in series.values() if len(dates)]
+        calendar = np.arange(min(d[0] for d in observed), max(d[-1] for d in observed) + 1) if observed \
+            else np.array([], dtype='datetime64[D]')
+        df = pd.DataFrame({date_column: np.datetime_as_string(calendar, unit='D')})
+        for panel_column, (dates, values) in series.items():
+            last = np.searchsorted(dates, calendar, side='right') - 1
+            df[panel_column] = np.where(last >= 0, values[np.maximum(last, 0)], np.nan) if len(values) else np.nan
+        return df
+    return transform
+
+
+# === CoinGecko ===
+def _coins(coins, raw):
+    """Resolve a {symbol: coin id} map (or a function returning one) to the coins present in raw."""
+    coins = coins() if callable(coins) else coins
+    return {symbol: coin_id for symbol, coin_id in coins.items() if coin_id in raw}
+
+
+def _isoformat(timestamps_ms):
+    """Vectorized datetime.utcfromtimestamp(ts / 1000).isoformat() for millisecond timestamps."""
+    dt = timestamps_ms.astype('datetime64[ms]')
+    out = np.datetime_as_string(dt, unit='s').astype(object)
+    with_micro = timestamps_ms % 1000 != 0
+    out[with_micro] = np.datetime_as_string(dt[with_micro], unit='us')
+    return out
+
+
+def volatility_range(coins):
+    """Build the 24h volatility / trading range transform for a symbol -> coin id map (or a function returning one).
+
+    All coins' price points are stacked into one array and each point is compared
+    with the previous point of the same coin, without per-row Python work.
+    """
+    def transform(raw):
+        present = _coins(coins, raw)
+        arrays = [np.asarray(raw[coin_id]['prices'], dtype=float).reshape(-1, 2) for coin_id in present.values()]
+        lengths = np.array([len(arr) for arr in arrays], dtype=int)
+        points = np.concatenate(arrays) if arrays else np.empty((0, 2))
+        symbols = np.repeat(np.array(list(present), dtype=object), lengths)
+
+        # Drop the first point of every coin: it has no previous point to compare with
+        first = np.zeros(len(points), dtype=bool)
+        first[np.cumsum(lengths)[lengths > 0] - lengths[lengths > 0]] = True
+        prev_price = np.roll(points[:, 1], 1)[~first]
+        curr = points[~first]
+
+        high = np.maximum(prev_price, curr[:, 1])
+        low = np.minimum(prev_price, curr[:, 1])
+        trading_range = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volatility = np.where(low > 0, trading_range / low * 100, 0.0)
+
+        return pd.DataFrame({
+            'symbol': symbols[~first],
+            'timestamp': _isoformat(curr[:, 0].astype(np.int64)),
+            'high_24h_usd': high,
+            'low_24h_usd': low,
+            'volatility_24h_%': np.round(volatility, 2),
+            'trading_range_24h_usd': np.round(trading_range, 2)
+        })
+    return transform
+
+
+def volume_traded(coins):
+    def transform(raw):
+        present = _coins(coins, raw)
+        arrays = [np.asarray(raw[coin_id]['total_volumes'], dtype=float).reshape(-1, 2) for coin_id in present.values()]
+        lengths = np.array([len(arr) for arr in arrays], dtype=int)
+        points = np.concatenate(arrays) if arrays else np.empty((0, 2))
+        return pd.DataFrame({
+            'symbol': np.repeat(np.array(list(present), dtype=object), lengths),
+            'date': np.datetime_as_string(points[:, 0].astype(np.int64).astype('datetime64[ms]'), unit='D').astype(object),
+            'volume_usd': points[:, 1]
+        })
+    return transform
+
+
+def market_cap(coins):
+    def transform(raw):
+        data = []
+        for symbol, coin_id in _coins(coins, raw).items():
+            chart = raw[coin_id]['chart']
+            circulating_supply = raw[coin_id]['circulating_supply']
+
+            df = pd.DataFrame(chart['prices'], columns=['timestamp', 'price'])
+            df['date'] = pd.to_datetime(df['timestamp'], unit='ms').dt.date
+
+            # The volume series can be missing points the price series has (or the reverse): match on timestamp
+            volumes = pd.DataFrame(chart['total_volumes'], columns=['timestamp', 'volume'])
+            volumes = volumes.drop_duplicates('timestamp', keep='last').set_index('timestamp')['volume']
+            df['volume'] = df['timestamp'].map(volumes)
+            df.drop(columns=['timestamp'], inplace=True)
+            df['market_cap'] = df['price'] * circulating_supply
+            df['symbol'] = symbol
+            data.append(df)
+        return pd.concat(data, ignore_index=True)
+    return transform
+
+
+def trending_coins(raw):
+    coin_list = []
+    for coin_info in raw['coins']:
+        coin = coin_info.get('item', {})
+        coin_list.append({
+            'name': coin.get('name'),
+            'symbol': coin.get('symbol'),
+            'id': coin.get('id'),
+            'market_cap_rank': coin.get('market_cap_rank'),
+            'score': coin.get('score')
+        })
+    return pd.DataFrame(coin_list)
+
+
+# === CoinDesk ===
+def coindesk_articles(raw):
+    # Articles arrive as an Arrow table already projected onto the table's columns (see coindesk.project)
+    if isinstance(raw, list):
+        # Fetch output stored before projection happened at fetch time
+        buffer = coindesk.ColumnBuffer()
+        for article in raw:
+            buffer.append(article)
+        raw = buffer.to_table()
+    return raw.select(coindesk.COLUMNS).to_pandas()
@@ -0,0 +1,124 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import cache, config, ratelimit, telemetry
+
+YAHOO_CACHE_DIR = os.path.join(config.CACHE_DIR, "yahoo")
+YAHOO_BATCH_SIZE = 100
+
+
+def _cache_path(ticker):
+    return os.path.join(YAHOO_CACHE_DIR, f"{ticker}.csv")
+
+
+# === Batched download ===
+def download_closes(tickers, start=None):
+    """One multi-ticker yf.download call; returns a DataFrame of (adjusted) closes with one column per ticker."""
+    import yfinance as yf
+
+    waited = time.perf_counter()
+    ratelimit.acquire('yahoo')
+    started = time.perf_counter()
+    if start is None:
+        data = yf.download(tickers, period="max", auto_adjust=True, progress=False)
+    else:
+        data = yf.download(tickers, start=start.strftime('%Y-%m-%d'), auto_adjust=True, progress=False)
+    telemetry.record_request('yahoo', time.perf_counter() - started, started - waited)
+    if data.empty:
+        return pd.DataFrame(columns=tickers)
+
+    if isinstance(data.columns, pd.MultiIndex):
+        closes = data['Close']
+    else:
+        closes = data[['Close']].rename(columns={'Close': tickers[0]})
+    closes.index = pd.to_datetime(closes.index).tz_localize(None)
+    return closes
+
+
+def download_shards(tickers, start=None, batch_size=YAHOO_BATCH_SIZE):
+    """download_closes over shards of batch_size; yields (shard, closes), empty closes for a failed shard."""
+    for i in range(0, len(tickers), batch_size):
+        shard = tickers[i:i + batch_size]
+        try:
+            closes = download_closes(shard, start=start)
+        except Exception as e:
+            print(f"❌ Yahoo download failed for {', '.join(shard)}: {e}")
+            closes = pd.DataFrame(columns=shard)
+        yield shard, closes
+
+
+# === Adjustment basis ===
+def _overlap_start(cached):
+    """Start of an incremental download: the last settled cached bar (the one before the watermark).
+
+    Re-downloading it shows whether the history was re-adjusted since it was cached.
+    """
+    if cached is None or len(cached) < 2:
+        return cache.watermark(cached)
+    return cached.index[-2]
+
+
+def _readjusted(cached, new):
+    """Whether a dividend or split since the last fetch put new bars on another adjustment basis.
+
+    Closes are adjusted backwards from the latest bar, so a settled bar downloaded again
+    only differs from its cached copy when the adjustment changed.
+    """
+    settled = _overlap_start(cached)
+    if settled is None or settled not in new.index or settled == cache.watermark(cached):
+        return False
+    return not np.isclose(new[settled], cached[settled], rtol=1e-6, atol=0)
+
+
+def get_closes(tickers, batch_size=YAHOO_BATCH_SIZE):
+    """Return {ticker: daily close Series} for every ticker, downloading only bars
+    from each ticker's last cached dates onward.
+
+    Tickers sharing a start date are downloaded together in shards of batch_size.
+    A ticker whose history was re-adjusted since it was cached (see _readjusted) is
+    downloaded again in full. Tickers that return no data and have no cache are left out.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    cached = {ticker: cache.load_series(_cache_path(ticker), 'close') for ticker in tickers}
+
+    # Group tickers by start date so each download has a single one
+    groups = {}
+    for ticker in tickers:
+        groups.setdefault(_overlap_start(cached[ticker]), []).append(ticker)
+
+    results = {}
+    readjusted = []
+    for start, group in groups.items():
+        for shard, closes in download_shards(group, start=start, batch_size=batch_size):
+            for ticker in shard:
+                # The watermark bar is re-downloaded so a partial (intraday) close gets replaced
+                new = closes[ticker].dropna() if ticker in closes else pd.Series(dtype=float)
+                if _readjusted(cached[ticker], new):
+                    readjusted.append(ticker)
+                    continue
+                merged = cache.merge_observations(cached[ticker], new)
+                if merged.empty:
+                    print(f"❌ No Yahoo data for {ticker}")
+                    continue
+                if not new.empty:
+                    cache.save_series(_cache_path(ticker), merged, 'close')
+                results[ticker] = merged.rename(None)
+
+    if readjusted:
+        print(f"🔁 Yahoo history re-adjusted (dividend or split) for {', '.join(readjusted)}, downloading it in full")
+    for shard, closes in download_shards(readjusted, batch_size=batch_size):
+        for ticker in shard:
+            new = closes[ticker].dropna() if ticker in closes else pd.Series(dtype=float)
+            if new.empty:
+                # Keep serving the cached history rather than none; the next run retries
+                print(f"❌ Yahoo full download failed for {ticker}, keeping the cached history")
+                results[ticker] = cached[ticker].rename(None)
+                continue
+            new = new.sort_index()
+            cache.save_series(_cache_path(ticker), new, 'close')
+            results[ticker] = new.rename(None)
+
+    return results
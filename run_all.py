@@ -1,49 +1,148 @@
-import concurrent.futures
-import subprocess
+import argparse
 import os
-import time
-
-# Directory where your scripts are located
-SCRIPTS_DIR = 'path/to/your/scripts'
-
-# List of scripts to run
-scripts = [
-    '24h Volatility & Trading Range.py',
-    'CoinDeskSentiment.py',
-    'ConsumerConfidence.py',
-    'CurrencyExchange.py',
-    'GDPData.py',
-    'GlobalGDP.py',
-    'GoogleTrending.py',
-    'InflationData.py',
-    'InterestRate.py',
-    'MarketCap.py',
-    'PricesScript.py',
-    'UnemploymentData.py',
-    'VolumeTraded.py',
-    'retailConsumption.py'
+import sys
+from datetime import datetime, timezone
+
+# Directory where the dataset scripts and the shared pipeline package live
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'code')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from pipeline import (  # noqa: E402
+    backfill_datasets, get_dataset, rebuild_dataset, resume_datasets, reupload_dataset, run_datasets,
+)
+from pipeline.journal import unfinished  # noqa: E402
+from pipeline.schedule import due_datasets  # noqa: E402
+from pipeline.telemetry import read_spans  # noqa: E402
+
+# List of datasets (Dune table names) to run
+datasets = [
+    'crypto_365d_volatility_range',
+    'coindesk_sentiment',
+    'consumer_confidence',
+    'currency_exchange',
+    'us_gdp',
+    'global_gdp',
+    'trending_coins',
+    'us_inflation',
+    'fed_interest_rate',
+    'market_cap_data',
+    'volatility_trading_range_data',
+    'unemployment_data',
+    'crypto_volume_traded',
+    'us_retail_consumption',
+    'us_m2',
+    'housing_permits_data',
+    'btc_daily_close_price',
+    'gold_daily_close_price',
+    'qqq_daily_close_price',
+    'spy_daily_close_price',
+    'dxy_daily_close_price',
+    'china_m2',
+    'korea_m2',
+    'india_m3_sources',
 ]
 
-# Function to run a script
-def run_script(script_name):
-    script_path = os.path.join(SCRIPTS_DIR, script_name)
-    try:
-        print(f"Running script: {script_name}")
-        subprocess.run(['python', script_path], check=True)
-        print(f"Script {script_name} completed successfully.")
-    except subprocess.CalledProcessError as e:
-        print(f"Error in script {script_name}: {e}")
-    time.sleep(2)  # Small delay to avoid rate limiting or too many requests at once
-
-# Main function to run scripts concurrently or sequentially
-def run_all_scripts():
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        # Submit all scripts for parallel execution
-        futures = [executor.submit(run_script, script) for script in scripts]
-
-        # Wait for all scripts to complete
-        for future in concurrent.futures.as_completed(futures):
-            future.result()  # This will raise an exception if the script failed
+# Panels joined from the stored tables of the datasets above (run with --panel)
+panels = ['macro_panel']
+
+
+# Datasets whose natural cadence says they should refresh on this tick
+def scheduled_datasets():
+    due = due_datasets([get_dataset(name) for name in datasets])
+    print(f"{len(due)} of {len(datasets)} datasets due:")
+    for name, reason in due.items():
+        print(f"  {name}: {reason}")
+    return list(due)
+
+
+# Main function: every dataset runs inside this one warm process
+def run_all_datasets(names=None):
+    names = datasets if names is None else names
+    if not names:
+        print("Nothing to run.")
+        return {}
+    return report(run_datasets(names))
+
+
+# Datasets whose last run failed or was interrupted, redone from the first unfinished stage
+def resume_failed():
+    failed = unfinished(datasets)
+    for name, entry in failed.items():
+        print(f"  {name}: failed at {entry.get('failed_stage') or 'an unknown stage'} ({entry.get('error')})")
+    return resume_datasets(list(failed)) if failed else {}
+
+
+# A cron tick: finish what the last tick left undone, then run what is newly due
+def run_tick():
+    resumed = resume_failed()
+    due = [name for name in scheduled_datasets() if name not in resumed]
+    results = run_datasets(due) if due else {}
+    if not resumed and not due:
+        print("Nothing to run.")
+        return {}
+    return report({**resumed, **results})
+
+
+# Summary of a run: failures, skipped uploads and the slowest stages
+def report(results):
+    failed = [name for name, result in results.items() if result.get('status', 'ok') == 'failed']
+    busy = [name for name, result in results.items() if result.get('status') == 'busy']
+    print(f"Finished {len(results)} datasets, {len(failed)} failed.")
+    for name in failed:
+        print(f"Error in dataset {name}: {results[name]['error']}")
+    if busy:
+        print(f"Left {len(busy)} datasets to the process already running them: {', '.join(busy)}")
+
+    skipped = [result['upload'] for result in results.values() if result.get('upload') and result['upload']['skipped']]
+    print(f"Skipped {len(skipped)} unchanged uploads ({sum(upload['csv_bytes'] for upload in skipped):,} bytes avoided).")
+
+    # Where the time went: the slowest individual stages of this run
+    wrappers = ('run', 'rebuild', 'reupload', 'backfill', 'resume')
+    stages = sorted((span for span in read_spans() if span['stage'] not in wrappers),
+                    key=lambda span: span['seconds'], reverse=True)
+    print("Slowest stages:")
+    for span in stages[:5]:
+        print(f"  {span['dataset'] or span.get('source')} {span['stage']}: {span['seconds']:.2f}s")
+    return results
+
 
 if __name__ == '__main__':
-    run_all_scripts()
+    parser = argparse.ArgumentParser(description="Fetch, store and upload the Dune datasets.")
+    parser.add_argument('names', nargs='*', help="datasets to run (default: the ones due on this tick)")
+    parser.add_argument('--all', action='store_true', help="run every dataset, due or not")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="re-run transforms on the stored fetch output and upload, without calling providers")
+    parser.add_argument('--reupload', action='store_true',
+                        help="upload the stored tables as they are")
+    parser.add_argument('--resume', action='store_true',
+                        help="only redo the unfinished stages of datasets whose last run failed")
+    parser.add_argument('--backfill', metavar='START',
+                        help="backfill the CoinGecko chart datasets from START (YYYY-MM-DD); resumes if interrupted")
+    parser.add_argument('--until', metavar='END', help="end of the backfill (YYYY-MM-DD, default: now)")
+    parser.add_argument('--granularity', choices=['daily', 'hourly'], default='daily',
+                        help="daily history feeds the regular tables; hourly goes to <table>_hourly")
+    parser.add_argument('--panel', action='store_true',
+                        help="afterwards rebuild and upload the wide panels from the stored tables")
+    args = parser.parse_args()
+
+    def timestamp(day):
+        return int(datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+    if args.backfill:
+        report(backfill_datasets(timestamp(args.backfill), timestamp(args.until) if args.until else None,
+                                 names=args.names or None, granularity=args.granularity))
+    elif args.rebuild:
+        for name in args.names or datasets:
+            rebuild_dataset(name)
+    elif args.reupload:
+        for name in args.names or datasets:
+            reupload_dataset(name)
+    elif args.resume:
+        report(resume_failed())
+    elif args.names or args.all:
+        run_all_datasets(args.names or None)
+    else:
+        run_tick()
+
+    if args.panel:
+        run_all_datasets(panels)
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code"))
+
+from pipeline import cache  # noqa: E402
+
+
+def test_save_load_series_round_trip_is_bit_exact(tmp_path):
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.random(5000) * 10.0 ** rng.integers(-8, 12, 5000),
+                             [182.28188355955652, 0.1 + 0.2, np.nan, -0.0, 1e300]])
+    data = pd.Series(values, index=pd.date_range("1990-01-01", periods=len(values), freq="D"))
+    path = os.path.join(tmp_path, "series.csv")
+
+    cache.save_series(path, data, 'value')
+    loaded = cache.load_series(path, 'value')
+
+    assert loaded.index.equals(data.index)
+    assert loaded.to_numpy().tobytes() == data.to_numpy().tobytes()